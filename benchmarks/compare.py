@@ -0,0 +1,45 @@
+"""
+Сравнение двух прогонов benchmarks.run.
+
+    python -m benchmarks.compare before.json after.json --threshold 10
+
+Печатает изменение rps и p95 по сценариям и завершается с кодом 1,
+если p95 какого-либо сценария вырос больше чем на threshold процентов.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def load(path):
+    return json.loads(Path(path).read_text())['results']
+
+
+def change(before, after):
+    return (after - before) / before * 100 if before else 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--threshold', type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    before, after = load(args.before), load(args.after)
+    regressions = []
+    for scenario in sorted(set(before) & set(after)):
+        rps = change(before[scenario]['rps'], after[scenario]['rps'])
+        p95 = change(before[scenario]['p95_ms'], after[scenario]['p95_ms'])
+        print(f'{scenario:<16} rps {rps:+7.1f}%   p95 {p95:+7.1f}%')
+        if p95 > args.threshold:
+            regressions.append(scenario)
+    if regressions:
+        print('Регрессия p95: ' + ', '.join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""
+Бенчмарк конкурентности: много медленных клиентов.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.concurrency --clients 50 --client-delay 200 \
+        --output benchmarks/results/concurrency.json
+
+Сравниваются три режима, каждый в отдельном процессе со своей базой:
+
+    wsgi        синхронные вьюхи, пул из --threads потоков; поток занят,
+                пока клиент медленно шлёт запрос и читает ответ;
+    asgi-sync   ASGI, синхронные вьюхи (Django 3.2 выполняет их в одном
+                общем потоке);
+    asgi-async  ASGI, вьюхи из blog.async_views (BLOG_ASYNC_VIEWS=1).
+
+Приложение вызывается напрямую, без сети: медленный клиент — это
+задержка --client-delay мс, поровну до отправки запроса и на чтение
+ответа. --db-latency добавляет задержку к каждому SQL-запросу, как у
+базы на другом сервере: SQLite в том же процессе отвечает без ожидания,
+и выигрыш асинхронных вьюх виден только когда запросы чего-то ждут.
+Для каждого режима сохраняются requests/sec и p50/p95/p99.
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'blogicum'))
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+from benchmarks.run import (  # noqa: E402
+    build_requests, git_revision, percentile,
+)
+from django.core.asgi import get_asgi_application  # noqa: E402
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+from django.db.backends.signals import connection_created  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+)
+
+from blog.seeding import seed_blog  # noqa: E402
+
+MODES = ('wsgi', 'asgi-sync', 'asgi-async')
+SCENARIOS = ('index', 'category_posts', 'profile', 'post_detail')
+
+
+def split_url(url):
+    path, _, query = url.partition('?')
+    return path, query
+
+
+def without_option(argv, option):
+    """Аргументы без option в обеих формах: --opt value и --opt=value."""
+    result = []
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg == option:
+            skip = True
+        elif not arg.startswith(f'{option}='):
+            result.append(arg)
+    return result
+
+
+def summary(timings, elapsed):
+    timings = sorted(timings)
+    return {
+        'requests': len(timings),
+        'rps': round(len(timings) / elapsed, 2),
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+    }
+
+
+def add_db_latency(seconds):
+    """Задержка перед каждым запросом во всех соединениях."""
+    def delayed(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        # Обёртка живёт на объекте соединения и переживает переподключение.
+        if delayed not in connection.execute_wrappers:
+            connection.execute_wrappers.append(delayed)
+
+    connection_created.connect(install, weak=False)
+
+
+def run_wsgi(urls_per_client, delay, threads):
+    """Клиенты в потоках; сервер обслуживает не больше threads сразу."""
+    application = get_wsgi_application()
+    workers = threading.Semaphore(threads)
+    timings = []
+
+    def call(url):
+        path, query = split_url(url)
+        environ = {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': path,
+            'QUERY_STRING': query,
+            'SERVER_NAME': 'testserver',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': 'testserver',
+            'wsgi.input': io.BytesIO(),
+            'wsgi.errors': sys.stderr,
+            'wsgi.url_scheme': 'http',
+        }
+        status = []
+        start = time.perf_counter()
+        with workers:
+            time.sleep(delay / 2)
+            body = application(
+                environ, lambda code, headers: status.append(code)
+            )
+            b''.join(body)
+            body.close()
+            time.sleep(delay / 2)
+        timings.append((time.perf_counter() - start) * 1000)
+        if not status[0].startswith('200'):
+            raise RuntimeError(f'{url}: статус {status[0]}')
+
+    def client(urls):
+        for url in urls:
+            call(url)
+
+    started = time.perf_counter()
+    clients = [
+        threading.Thread(target=client, args=(urls,))
+        for urls in urls_per_client
+    ]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    return summary(timings, time.perf_counter() - started)
+
+
+def run_asgi(urls_per_client, delay):
+    """Клиенты — задачи asyncio, ожидание клиента потоков не занимает."""
+    application = get_asgi_application()
+    timings = []
+
+    async def call(url):
+        path, query = split_url(url)
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': query.encode(),
+            'headers': [(b'host', b'testserver')],
+            'server': ('testserver', 80),
+            'client': ('127.0.0.1', 50000),
+        }
+        status = []
+
+        async def receive():
+            await asyncio.sleep(delay / 2)
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                status.append(message['status'])
+            elif not message.get('more_body'):
+                await asyncio.sleep(delay / 2)
+
+        start = time.perf_counter()
+        await application(scope, receive, send)
+        timings.append((time.perf_counter() - start) * 1000)
+        if status[0] != 200:
+            raise RuntimeError(f'{url}: статус {status[0]}')
+
+    async def client(urls):
+        for url in urls:
+            await call(url)
+
+    async def run_all():
+        await asyncio.gather(*(client(urls) for urls in urls_per_client))
+
+    started = time.perf_counter()
+    asyncio.run(run_all())
+    return summary(timings, time.perf_counter() - started)
+
+
+def run_mode(args):
+    """Один режим в текущем процессе: своя база, данные, замер."""
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        seed_blog(
+            users=args.users,
+            posts_per_author=args.posts_per_author,
+            comments_per_post=args.comments_per_post,
+            seed=args.seed,
+            prefix='bench',
+        )
+        urls_per_client = []
+        for number in range(args.clients):
+            rng = random.Random(f'{args.seed}:{number}')
+            requests = build_requests(
+                rng.choice(args.scenario or SCENARIOS), rng,
+                args.requests_per_client
+            )
+            urls_per_client.append([url for _, url, _ in requests])
+        if args.db_latency:
+            add_db_latency(args.db_latency / 1000)
+        delay = args.client_delay / 1000
+        if args.mode == 'wsgi':
+            return run_wsgi(urls_per_client, delay, args.threads)
+        return run_asgi(urls_per_client, delay)
+    finally:
+        teardown_databases(old_config, verbosity=0)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--posts-per-author', default='fixed:10')
+    parser.add_argument('--comments-per-post', default='fixed:5')
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--requests-per-client', type=int, default=10)
+    parser.add_argument(
+        '--client-delay', type=float, default=200, metavar='MS',
+        help='Сколько медленный клиент отправляет запрос и читает ответ.'
+    )
+    parser.add_argument(
+        '--db-latency', type=float, default=0, metavar='MS',
+        help='Задержка каждого SQL-запроса, как у удалённой базы.'
+    )
+    parser.add_argument(
+        '--threads', type=int, default=8,
+        help='Потоков у WSGI-сервера.'
+    )
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument(
+        '--scenario', action='append', choices=SCENARIOS,
+        help='Сценарий; можно указать несколько. По умолчанию — все.'
+    )
+    parser.add_argument(
+        '--mode', action='append', choices=MODES,
+        help='Режим; можно указать несколько. По умолчанию — все.'
+    )
+    parser.add_argument('--output', type=Path)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    args = parse_args(argv)
+    if args.child:
+        args.mode = args.mode[0]
+        print(json.dumps(run_mode(args)))
+        return None
+
+    results = {}
+    for mode in args.mode or MODES:
+        # Выбор вьюх в blog/urls.py делается при импорте: отдельный процесс.
+        env = dict(
+            os.environ,
+            BLOG_ASYNC_VIEWS='1' if mode == 'asgi-async' else '0',
+        )
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.concurrency', '--child',
+             f'--mode={mode}', *without_option(argv, '--mode')],
+            cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+        ).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+        print(mode, results[mode])
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'clients': args.clients,
+            'requests_per_client': args.requests_per_client,
+            'client_delay_ms': args.client_delay,
+            'db_latency_ms': args.db_latency,
+            'wsgi_threads': args.threads,
+        },
+        'results': results,
+    }
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2)
+        )
+    return report
+
+
+if __name__ == '__main__':
+    main()
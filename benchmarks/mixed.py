@@ -0,0 +1,232 @@
+"""
+Бенчмарк одновременных чтения и записи.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.mixed --readers 8 --writers 2 --duration 10 \
+        --output benchmarks/results/mixed.json
+
+Читатели открывают страницы постов и главную, писатели добавляют
+комментарии. Каждый профиль настроек замеряется в отдельном процессе
+со своей базой-файлом:
+
+    default     blogicum.settings: соединение на каждый запрос, журнал
+                отката SQLite, в котором писатель блокирует читателей;
+    production  blogicum.settings_production: постоянные соединения,
+                WAL, synchronous=NORMAL, mmap и busy_timeout.
+
+--comment-buffer включает буфер записи комментариев (BLOG_COMMENT_BUFFER).
+
+Приложение вызывается через WSGI напрямую, клиенты — потоки. Для
+чтения и записи сохраняются requests/sec, p50/p95/p99 и число ошибок.
+"""
+import argparse
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'blogicum'))
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+from benchmarks.concurrency import (  # noqa: E402
+    split_url, summary, without_option,
+)
+from benchmarks.run import build_requests, git_revision  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.core.handlers.wsgi import WSGIHandler  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+)
+
+from blog.models import User  # noqa: E402
+from blog.seeding import seed_blog  # noqa: E402
+
+PROFILES = ('default', 'production')
+
+
+class BenchHandler(WSGIHandler):
+    """WSGI-обработчик без проверки CSRF, как у django.test.Client."""
+
+    def get_response(self, request):
+        request._dont_enforce_csrf_checks = True
+        return super().get_response(request)
+
+
+def call(application, method, url, payload, cookie):
+    path, query = split_url(url)
+    body = '&'.join(
+        f'{key}={value}' for key, value in (payload or {}).items()
+    ).encode()
+    environ = {
+        'REQUEST_METHOD': method.upper(),
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'SERVER_NAME': 'testserver',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': 'testserver',
+        'HTTP_COOKIE': cookie,
+        'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.url_scheme': 'http',
+    }
+    status = []
+    response = application(
+        environ, lambda code, headers: status.append(code)
+    )
+    b''.join(response)
+    response.close()
+    return int(status[0].split()[0])
+
+
+def run_clients(application, readers, writers, deadline, cookie):
+    """Читатели и писатели работают в потоках до deadline."""
+    results = {'reads': [], 'writes': []}
+    errors = {'reads': 0, 'writes': 0}
+
+    def client(kind, requests):
+        for method, url, payload in requests:
+            if time.perf_counter() >= deadline:
+                return
+            start = time.perf_counter()
+            status = call(application, method, url, payload, cookie)
+            results[kind].append((time.perf_counter() - start) * 1000)
+            if status >= 400:
+                errors[kind] += 1
+
+    threads = [
+        threading.Thread(target=client, args=('reads', requests))
+        for requests in readers
+    ] + [
+        threading.Thread(target=client, args=('writes', requests))
+        for requests in writers
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def run_profile(args):
+    """Один профиль в текущем процессе: своя база, данные, замер."""
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        seed_blog(
+            users=args.users,
+            posts_per_author=args.posts_per_author,
+            comments_per_post=args.comments_per_post,
+            seed=args.seed,
+            prefix='bench',
+        )
+        # Много запросов с запасом: клиенты останавливаются по времени.
+        size = 10000
+        readers = [
+            build_requests(
+                'post_detail' if number % 2 else 'index',
+                random.Random(f'{args.seed}:read:{number}'), size
+            )
+            for number in range(args.readers)
+        ]
+        writers = [
+            build_requests(
+                'add_comment',
+                random.Random(f'{args.seed}:write:{number}'), size
+            )
+            for number in range(args.writers)
+        ]
+        settings.BLOG_COMMENT_BUFFER = args.comment_buffer
+        author = Client()
+        author.force_login(User.objects.order_by('pk').first())
+        cookie = (
+            f'{settings.SESSION_COOKIE_NAME}='
+            f'{author.cookies[settings.SESSION_COOKIE_NAME].value}'
+        )
+        started = time.perf_counter()
+        results, errors = run_clients(
+            BenchHandler(), readers, writers,
+            started + args.duration, cookie
+        )
+        elapsed = time.perf_counter() - started
+        return {
+            kind: dict(summary(timings, elapsed), errors=errors[kind])
+            for kind, timings in results.items() if timings
+        }
+    finally:
+        teardown_databases(old_config, verbosity=0)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--posts-per-author', default='fixed:10')
+    parser.add_argument('--comments-per-post', default='fixed:5')
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument(
+        '--duration', type=float, default=10, metavar='SECONDS'
+    )
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--comment-buffer', action='store_true')
+    parser.add_argument(
+        '--profile', action='append', choices=PROFILES,
+        help='Профиль настроек; можно указать несколько. По умолчанию — все.'
+    )
+    parser.add_argument('--output', type=Path)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    args = parse_args(argv)
+    if args.child:
+        print(json.dumps(run_profile(args)))
+        return None
+
+    results = {}
+    for profile in args.profile or PROFILES:
+        # Профиль выбирается в benchmarks/settings.py: отдельный процесс.
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.mixed', '--child',
+             *without_option(argv, '--profile')],
+            cwd=ROOT, env=dict(os.environ, BENCH_PROFILE=profile),
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results[profile] = json.loads(output.strip().splitlines()[-1])
+        print(profile, results[profile])
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'database': os.environ.get('BENCH_DB', 'sqlite'),
+            'readers': args.readers,
+            'writers': args.writers,
+            'duration': args.duration,
+            'comment_buffer': args.comment_buffer,
+        },
+        'results': results,
+    }
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2)
+        )
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+"""
+Бенчмарк вьюх блога.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.run --users 250 --posts-per-author fixed:20 \
+        --comments-per-post fixed:10 --output benchmarks/results/sqlite.json
+    BENCH_DB=postgres python -m benchmarks.run ...
+
+Скрипт создаёт отдельную базу, заполняет её генератором
+blog.seeding (тем же, что у команды seed_blog), прогоняет запросы
+через django.test.Client (без сети, поэтому результаты
+воспроизводимы) и сохраняет requests/sec и p50/p95/p99 по каждому
+сценарию в JSON.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'blogicum'))
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+)
+
+from blog.models import Category, User  # noqa: E402
+from blog.seeding import seed_blog  # noqa: E402
+from blog.views import get_published_posts  # noqa: E402
+
+SCENARIOS = (
+    'index', 'category_posts', 'profile', 'post_detail', 'add_comment'
+)
+
+
+def percentile(values, rank):
+    """Перцентиль методом ближайшего ранга; values отсортированы."""
+    index = max(int(round(rank / 100 * len(values))) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_requests(scenario, rng, n):
+    """Список (метод, url, данные) для сценария; выбор детерминирован."""
+    posts = list(get_published_posts().order_by('pk').values_list(
+        'pk', flat=True
+    )[:1000])
+    if scenario == 'index':
+        return [('get', f'/?page={rng.randint(1, 20)}', None)
+                for _ in range(n)]
+    if scenario == 'category_posts':
+        slugs = list(Category.objects.values_list('slug', flat=True))
+        return [('get', f'/category/{rng.choice(slugs)}/', None)
+                for _ in range(n)]
+    if scenario == 'profile':
+        names = list(User.objects.values_list('username', flat=True))
+        return [('get', f'/profile/{rng.choice(names)}/', None)
+                for _ in range(n)]
+    if scenario == 'post_detail':
+        return [('get', f'/posts/{rng.choice(posts)}/', None)
+                for _ in range(n)]
+    if scenario == 'add_comment':
+        return [
+            ('post', f'/posts/{rng.choice(posts)}/comment/',
+             {'text': f'Комментарий бенчмарка {i}'})
+            for i in range(n)
+        ]
+    raise ValueError(scenario)
+
+
+def measure(client, requests, warmup):
+    for method, url, payload in requests[:warmup]:
+        getattr(client, method)(url, payload)
+    timings = []
+    started = time.perf_counter()
+    for method, url, payload in requests[warmup:]:
+        start = time.perf_counter()
+        response = getattr(client, method)(url, payload)
+        timings.append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            raise RuntimeError(f'{url}: статус {response.status_code}')
+    elapsed = time.perf_counter() - started
+    timings.sort()
+    return {
+        'requests': len(timings),
+        'rps': round(len(timings) / elapsed, 2),
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--posts-per-author', default='fixed:20')
+    parser.add_argument('--comments-per-post', default='fixed:10')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument(
+        '--scenario', action='append', choices=SCENARIOS,
+        help='Сценарий; можно указать несколько. По умолчанию — все.'
+    )
+    parser.add_argument(
+        '--page-cache', type=int, default=0, metavar='SECONDS',
+        help='Включить кэш страниц для анонимных запросов к лентам.'
+    )
+    parser.add_argument('--output', type=Path)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        stats = seed_blog(
+            users=args.users,
+            posts_per_author=args.posts_per_author,
+            comments_per_post=args.comments_per_post,
+            seed=args.seed,
+            prefix='bench',
+        )
+        dataset = {
+            name: rows for name, (rows, seconds) in stats.items()
+            if name not in ('comment_count', 'search_index')
+        }
+        settings.BLOG_PAGE_CACHE_TIMEOUT = args.page_cache
+        # Ленты читает аноним, комментарии пишет авторизованный пользователь.
+        anonymous = Client()
+        author = Client()
+        author.force_login(User.objects.order_by('pk').first())
+        results = {}
+        for scenario in args.scenario or SCENARIOS:
+            rng = random.Random(f'{args.seed}:{scenario}')
+            requests = build_requests(
+                scenario, rng, args.requests + args.warmup
+            )
+            client = author if scenario == 'add_comment' else anonymous
+            results[scenario] = measure(client, requests, args.warmup)
+            print(scenario, results[scenario])
+        report = {
+            'meta': {
+                'revision': git_revision(),
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'dataset': dataset,
+                'requests': args.requests,
+                'warmup': args.warmup,
+                'page_cache': args.page_cache,
+            },
+            'results': results,
+        }
+    finally:
+        teardown_databases(old_config, verbosity=0)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2)
+        )
+    return report
+
+
+if __name__ == '__main__':
+    main()
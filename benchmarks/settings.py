@@ -0,0 +1,53 @@
+"""
+Настройки для бенчмарков: те же, что у проекта, но с отдельной базой.
+
+BENCH_DB=sqlite (по умолчанию) — файл во временном каталоге;
+BENCH_DB=postgres — локальный PostgreSQL из переменных BENCH_PG_*.
+BENCH_PROFILE=production — поверх профиля blogicum.settings_production
+(постоянные соединения, PRAGMA для SQLite).
+"""
+import os
+import tempfile
+from pathlib import Path
+
+BENCH_PROFILE = os.environ.get('BENCH_PROFILE', 'default')
+
+if BENCH_PROFILE == 'production':
+    os.environ.setdefault('DJANGO_SECRET_KEY', 'benchmark-only-secret-key')
+    from blogicum.settings_production import *  # noqa: F401,F403
+else:
+    from blogicum.settings import *  # noqa: F401,F403
+
+DEBUG = False
+ALLOWED_HOSTS = ['testserver', 'localhost', '127.0.0.1']
+
+BENCH_DB = os.environ.get('BENCH_DB', 'sqlite')
+
+if BENCH_DB == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('BENCH_PG_NAME', 'blogicum_bench'),
+            'USER': os.environ.get('BENCH_PG_USER', 'postgres'),
+            'PASSWORD': os.environ.get('BENCH_PG_PASSWORD', ''),
+            'HOST': os.environ.get('BENCH_PG_HOST', '127.0.0.1'),
+            'PORT': os.environ.get('BENCH_PG_PORT', '5432'),
+        }
+    }
+else:
+    BENCH_SQLITE = Path(tempfile.gettempdir()) / 'blogicum_bench.sqlite3'
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BENCH_SQLITE,
+            'TEST': {'NAME': BENCH_SQLITE},
+        }
+    }
+
+if BENCH_PROFILE == 'production':
+    DATABASES['default']['CONN_MAX_AGE'] = DB_CONN_MAX_AGE  # noqa: F405
+
+# Кэш страниц включается флагом --page-cache, иначе меряются сами вьюхи.
+BLOG_PAGE_CACHE_TIMEOUT = 0
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
@@ -0,0 +1,82 @@
+"""
+Микробенчмарк построения адресов: reverse() против blog.fast_urls.
+
+    python -m benchmarks.urls --number 20000
+
+База не нужна. Замер идёт как внутри запроса (после сигнала
+request_started). Для каждого маршрута печатается время одного вызова
+в микросекундах и ускорение.
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'blogicum'))
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.signals import (  # noqa: E402
+    request_finished, request_started,
+)
+from django.urls import reverse  # noqa: E402
+
+from blog.fast_urls import blog_url  # noqa: E402
+
+CASES = (
+    ('index', ()),
+    ('post_detail', (12345,)),
+    ('profile', ('bench_user_42',)),
+    ('category_posts', ('bench-category-7',)),
+    ('edit_comment', (12345, 678)),
+)
+
+
+def measure(func, number, repeat):
+    """Лучшее время одного вызова в микросекундах."""
+    best = min(timeit.repeat(func, number=number, repeat=repeat))
+    return best / number * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--number', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', type=Path)
+    args = parser.parse_args(argv)
+
+    results = {}
+    request_started.send(sender=None)
+    for name, route_args in CASES:
+        assert blog_url(name, *route_args) == reverse(
+            f'blog:{name}', args=route_args
+        )
+        slow = measure(
+            lambda: reverse(f'blog:{name}', args=route_args),
+            args.number, args.repeat
+        )
+        fast = measure(
+            lambda: blog_url(name, *route_args), args.number, args.repeat
+        )
+        results[name] = {
+            'reverse_us': round(slow, 3),
+            'blog_url_us': round(fast, 3),
+            'speedup': round(slow / fast, 1),
+        }
+        print(name, results[name])
+    request_finished.send(sender=None)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,82 @@
+from django import forms
+from django.conf import settings
 from django.contrib import admin
-from .models import Category, Location, Post, Comment
+from django.utils import timezone
+from . import signals
+from .admin_filters import AutocompleteFilter
+from .exporting import export_response
+from .models import Category, Location, Post, Comment, Job
+from .pagination import EstimatedCountPaginator
+
+
+def large_tables():
+    return getattr(settings, 'BLOG_ADMIN_LARGE_TABLES', False)
+
+
+class LargeTableAdminMixin:
+    """
+    Режим BLOG_ADMIN_LARGE_TABLES для больших таблиц: без точного
+    COUNT(*) в пагинаторе и в счётчике «всего», фильтры по внешним
+    ключам с поиском вместо списка всех значений.
+    """
+
+    @property
+    def show_full_result_count(self):
+        return not large_tables()
+
+    def get_paginator(self, request, queryset, per_page, *args, **kwargs):
+        if large_tables():
+            return EstimatedCountPaginator(queryset, per_page, *args, **kwargs)
+        return super().get_paginator(
+            request, queryset, per_page, *args, **kwargs
+        )
+
+    def get_list_filter(self, request):
+        list_filter = super().get_list_filter(request)
+        if not large_tables():
+            return list_filter
+        return [
+            (name, AutocompleteFilter) if self._is_foreign_key(name) else name
+            for name in list_filter
+        ]
+
+    def _is_foreign_key(self, name):
+        if not isinstance(name, str) or '__' in name:
+            return False
+        return self.model._meta.get_field(name).many_to_one
+
+    @property
+    def media(self):
+        media = super().media
+        if large_tables():
+            media += forms.Media(
+                js=(
+                    'admin/js/vendor/jquery/jquery.min.js',
+                    'admin/js/vendor/select2/select2.full.min.js',
+                    'admin/js/jquery.init.js',
+                    'admin/js/autocomplete.js',
+                ),
+                css={'screen': (
+                    'admin/css/vendor/select2/select2.min.css',
+                    'admin/css/autocomplete.css',
+                )},
+            )
+        return media
+
+
+@admin.action(description='Выгрузить выбранные в JSON Lines')
+def export_jsonl(modeladmin, request, queryset):
+    return export_response(queryset, 'jsonl')
+
+
+@admin.action(description='Выгрузить выбранные в CSV')
+def export_csv(modeladmin, request, queryset):
+    return export_response(queryset, 'csv')
+
+
+@admin.action(description='Выгрузить выбранные в JSON Lines (gzip)')
+def export_jsonl_gzip(modeladmin, request, queryset):
+    return export_response(queryset, 'jsonl', compress=True)
 
 
 @admin.register(Category)
@@ -17,24 +94,75 @@ class LocationAdmin(admin.ModelAdmin):
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
         'title',
         'pub_date',
         'author',
         'category',
         'location',
+        'comment_count',
         'is_published'
     )
     list_filter = ('category', 'location', 'is_published')
     list_editable = ('is_published',)
+    list_select_related = ('author', 'category', 'location')
     search_fields = ('title', 'text')
-    date_hierarchy = 'pub_date'
     raw_id_fields = ('author',)
+    autocomplete_fields = ('category', 'location')
+    actions = (export_jsonl, export_csv, export_jsonl_gzip)
+
+    @property
+    def date_hierarchy(self):
+        # Навигация по датам перебирает даты всех постов.
+        return None if large_tables() else 'pub_date'
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('author', 'post', 'text', 'created_at', 'is_published')
     list_filter = ('is_published', 'created_at')
-    search_fields = ('text', 'author__username')
\ No newline at end of file
+    list_select_related = ('author', 'post')
+    search_fields = ('text', 'author__username')
+    autocomplete_fields = ('post', 'author')
+    actions = (
+        'publish_comments',
+        'unpublish_comments',
+        export_jsonl,
+        export_csv,
+        export_jsonl_gzip,
+    )
+
+    def _set_published(self, queryset, is_published):
+        # update() не шлёт сигналы: счётчики, updated_at (ETag страницы
+        # поста) и кэш лент обновляются здесь, как в blog.signals.
+        post_ids = set(queryset.values_list('post_id', flat=True))
+        queryset.update(is_published=is_published)
+        Post.objects.filter(pk__in=post_ids).recount_comments(
+            updated_at=timezone.now()
+        )
+        signals.purge_post_feeds(signals.get_post_feeds(post_ids))
+
+    @admin.action(description='Опубликовать выбранные комментарии')
+    def publish_comments(self, request, queryset):
+        self._set_published(queryset, True)
+
+    @admin.action(description='Снять с публикации выбранные комментарии')
+    def unpublish_comments(self, request, queryset):
+        self._set_published(queryset, False)
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'task', 'args', 'status', 'attempts', 'run_after', 'finished_at'
+    )
+    list_filter = ('status', 'task')
+    readonly_fields = ('last_error', 'created_at', 'locked_at', 'finished_at')
+    actions = ('retry_jobs',)
+
+    @admin.action(description='Повторить выбранные задачи')
+    def retry_jobs(self, request, queryset):
+        queryset.exclude(status=Job.RUNNING).update(
+            status=Job.PENDING, attempts=0, run_after=timezone.now()
+        )
\ No newline at end of file
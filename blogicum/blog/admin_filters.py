@@ -0,0 +1,46 @@
+from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+
+
+class AutocompleteFilter(admin.FieldListFilter):
+    """
+    Фильтр по внешнему ключу с поиском вместо списка всех значений.
+    Варианты подгружает стандартный autocomplete_view админки, поэтому у
+    админки связанной модели должны быть заданы search_fields.
+    """
+
+    template = 'admin/blog/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin,
+                 field_path):
+        self.lookup_kwarg = f'{field_path}__{field.target_field.name}__exact'
+        self.lookup_val = params.get(self.lookup_kwarg)
+        super().__init__(
+            field, request, params, model, model_admin, field_path
+        )
+        # Виджет формы: подставляет подпись выбранного значения.
+        self.widget = field.formfield(
+            widget=AutocompleteSelect(field, model_admin.admin_site),
+            required=False,
+        ).widget
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    def choices(self, changelist):
+        # Один «вариант»: данные для формы фильтра в шаблоне.
+        yield {
+            'selected': self.lookup_val is not None,
+            'query_string': changelist.get_query_string(
+                remove=[self.lookup_kwarg]
+            ),
+            'select': self.widget.render(
+                self.lookup_kwarg,
+                self.lookup_val,
+                attrs={'onchange': 'this.form.submit()'},
+            ),
+            'hidden_params': [
+                (key, value) for key, value in changelist.params.items()
+                if key not in (self.lookup_kwarg, 'p')
+            ],
+        }
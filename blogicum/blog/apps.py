@@ -1,7 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
     verbose_name = 'Блог'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        if getattr(settings, 'BLOG_WARM_TEMPLATES', False):
+            from .warmup import warm_templates_on_startup
+            warm_templates_on_startup()
@@ -0,0 +1,46 @@
+"""
+Асинхронные варианты вьюх, которые только читают данные.
+
+Под ASGI Django 3.2 выполняет синхронные вьюхи в одном общем потоке,
+так что запросы к лентам и постам идут строго по одному. ORM в 3.2
+ещё синхронный, поэтому асинхронные вьюхи отдают обычную вьюху целиком
+(с ETag, кэшем страниц и рендером) в пул потоков: запросы выполняются
+параллельно, а медленные клиенты обслуживает цикл событий сервера и
+потоки не держат. Подключаются в blog/urls.py при BLOG_ASYNC_VIEWS,
+который включает blogicum/asgi.py.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+from . import views
+from .middleware import count_queries
+
+
+def in_thread_pool(view):
+    """
+    Асинхронная обёртка синхронной вьюхи: вызов в пуле потоков.
+    Сигнал request_finished закрывает соединения с базой только в
+    потоке обработчика, поэтому поток пула закрывает свои сам; запросы
+    из него QueryBudgetMiddleware учитывает через count_queries().
+    """
+    def run(request, *args, **kwargs):
+        try:
+            with count_queries():
+                return view(request, *args, **kwargs)
+        finally:
+            close_old_connections()
+
+    run_in_pool = sync_to_async(run, thread_sensitive=False)
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        return await run_in_pool(request, *args, **kwargs)
+    return wrapper
+
+
+index = in_thread_pool(views.index)
+category_posts = in_thread_pool(views.category_posts)
+profile = in_thread_pool(views.profile)
+post_detail = in_thread_pool(views.post_detail)
@@ -0,0 +1,145 @@
+from functools import wraps
+from urllib.parse import urlencode
+from uuid import uuid4
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+
+from . import routers, schedule
+
+VERSION_KEY = 'blog:version:{model}:{pk}'
+
+
+def _version_key(model, pk):
+    return VERSION_KEY.format(model=model, pk=pk)
+
+
+def bump_version(model, pk):
+    """Делает недействительными фрагменты, зависящие от объекта."""
+    cache.set(_version_key(model, pk), uuid4().hex, None)
+
+
+def get_versions(*objects):
+    """
+    Возвращает версии объектов вида (model, pk) одной строкой.
+    Пропавшая из кэша версия заменяется новой, а не нулевой,
+    чтобы не поднять устаревший фрагмент.
+    """
+    keys = [_version_key(model, pk) for model, pk in objects]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            versions[key] = uuid4().hex
+            if not cache.add(key, versions[key], None):
+                versions[key] = cache.get(key, versions[key])
+    return '.'.join(versions[key] for key in keys)
+
+
+def post_card_version(post):
+    """Версия карточки поста: сам пост, категория, место и автор."""
+    return '{}.{}'.format(post.comment_count, get_versions(
+        ('post', post.pk),
+        ('category', post.category_id),
+        ('location', post.location_id),
+        ('user', post.author_id),
+    ))
+
+
+# ========== КЭШ СТРАНИЦ ДЛЯ АНОНИМНЫХ ПОЛЬЗОВАТЕЛЕЙ ==========
+
+PAGE_KEY = 'blog:page:{versions}:{path}?{params}'
+PAGE_PARAMS = ('page', 'after', 'before')
+ALL_FEEDS = 'all'
+
+
+def index_feed():
+    return 'index'
+
+
+def category_feed(category_slug):
+    return f'category:{category_slug}'
+
+
+def profile_feed(username):
+    return f'profile:{username}'
+
+
+def purge_feeds(*scopes):
+    """
+    Сбрасывает кэш страниц лент.
+    scope — 'index', 'category:<slug>', 'profile:<username>'
+    или ALL_FEEDS для всех лент сразу.
+    """
+    for scope in scopes:
+        bump_version('feed', scope)
+
+
+def purge_post_feeds(category_slug, username):
+    """Сбрасывает ленты, в которых может показываться пост."""
+    purge_feeds(
+        index_feed(),
+        category_feed(category_slug),
+        profile_feed(username)
+    )
+
+
+def page_cache_timeout():
+    """
+    Время жизни страницы: не дольше BLOG_PAGE_CACHE_TIMEOUT и не дольше,
+    чем до выхода ближайшего отложенного поста.
+    """
+    return schedule.seconds_valid(
+        getattr(settings, 'BLOG_PAGE_CACHE_TIMEOUT', 0)
+    )
+
+
+def feed_versions(scope):
+    return get_versions(('feed', ALL_FEEDS), ('feed', scope))
+
+
+def page_params(request):
+    """Параметры запроса, от которых зависит страница ленты."""
+    return urlencode([
+        (name, request.GET[name])
+        for name in PAGE_PARAMS if name in request.GET
+    ])
+
+
+def can_cache_page(request):
+    return (
+        request.method in ('GET', 'HEAD')
+        and not request.user.is_authenticated
+        and not len(messages.get_messages(request))
+    )
+
+
+def cache_anonymous_page(scope):
+    """
+    Кэширует страницу ленты для анонимных пользователей.
+    scope(**kwargs) возвращает область ленты, по которой её сбрасывать.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (not getattr(settings, 'BLOG_PAGE_CACHE_TIMEOUT', 0)
+                    or not can_cache_page(request)):
+                return view(request, *args, **kwargs)
+            key = PAGE_KEY.format(
+                versions=feed_versions(scope(**kwargs)),
+                path=request.path,
+                params=page_params(request)
+            )
+            response = cache.get(key)
+            if response is not None:
+                return response
+            # Страница пойдёт в кэш для всех: не с отстающей реплики.
+            with routers.primary_reads():
+                response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.cookies:
+                timeout = page_cache_timeout()
+                if timeout:
+                    cache.set(key, response, timeout)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,144 @@
+"""
+Буфер записи комментариев.
+
+При BLOG_COMMENT_BUFFER вьюха add_comment не пишет комментарий сама, а
+ставит его в очередь процесса. Поток записи копит очередь не дольше
+BLOG_COMMENT_BUFFER_DELAY секунд (или до BLOG_COMMENT_BUFFER_SIZE
+комментариев) и сохраняет её одним bulk_create в одной транзакции:
+сотня комментариев к популярному посту — одна блокировка записи SQLite
+вместо сотни. Порядок очереди сохраняется. Вьюха ждёт, пока её пачка
+не закоммитится, и только потом отвечает редиректом.
+
+bulk_create не шлёт сигналы, поэтому пересчёт счётчиков и сброс лент
+из blog.signals выполняются здесь, один раз на пачку.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from . import signals
+from .models import Comment, Post
+
+logger = logging.getLogger(__name__)
+
+# Сколько вьюха ждёт записи своей пачки.
+SAVE_TIMEOUT = 10
+
+
+class CommentPending(Exception):
+    """Пачка не записана за SAVE_TIMEOUT; комментарий остался в очереди."""
+
+
+class CommentBuffer:
+    def __init__(self, max_delay=0.005, max_batch=100):
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, comment):
+        """Ставит комментарий в очередь; Future завершится после коммита."""
+        future = Future()
+        self._queue.put((comment, future))
+        self._ensure_thread()
+        return future
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name='comment-buffer', daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                self._flush(batch)
+            except Exception as error:
+                logger.exception('Не удалось записать пачку комментариев')
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+            finally:
+                close_old_connections()
+
+    def _collect(self):
+        """Первый комментарий очереди и всё, что придёт за max_delay."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self, batch):
+        try:
+            with transaction.atomic():
+                Comment.objects.bulk_create([comment for comment, _ in batch])
+            saved = batch
+        except IntegrityError:
+            # Например, пост удалили: пишем по одному, чтобы ошибка
+            # досталась только своему комментарию.
+            saved = []
+            for comment, future in batch:
+                comment.pk = None
+                try:
+                    with transaction.atomic():
+                        Comment.objects.bulk_create([comment])
+                except IntegrityError as error:
+                    future.set_exception(error)
+                else:
+                    saved.append((comment, future))
+        post_ids = {comment.post_id for comment, _ in saved}
+        if post_ids:
+            Post.objects.filter(pk__in=post_ids).recount_comments(
+                updated_at=timezone.now()
+            )
+            signals.purge_post_feeds(signals.get_post_feeds(post_ids))
+        for comment, future in saved:
+            future.set_result(comment)
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = CommentBuffer(
+                max_delay=getattr(
+                    settings, 'BLOG_COMMENT_BUFFER_DELAY', 0.005
+                ),
+                max_batch=getattr(settings, 'BLOG_COMMENT_BUFFER_SIZE', 100),
+            )
+        return _buffer
+
+
+def save_comment(comment):
+    """
+    Сохраняет комментарий через буфер и ждёт коммита его пачки.
+    IntegrityError — комментарий не записан (например, поста нет),
+    другие DatabaseError — пачку не удалось записать, CommentPending —
+    запись не успела, комментарий ещё может сохраниться.
+    """
+    future = get_buffer().submit(comment)
+    try:
+        return future.result(SAVE_TIMEOUT)
+    except FutureTimeout:
+        raise CommentPending from None
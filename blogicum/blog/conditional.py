@@ -0,0 +1,106 @@
+"""
+Валидаторы для условных GET-запросов (ETag / Last-Modified).
+
+Функции передаются в django.views.decorators.http.condition и позволяют
+отвечать 304 Not Modified без рендера шаблона.
+
+Страницы вошедшего пользователя содержат {% csrf_token %} (выход в
+шапке, форма комментария), поэтому в ETag входит CSRF-токен из cookie:
+после нового входа токен меняется, и браузер получает страницу с новым
+токеном, а не 304 со старым.
+"""
+import hashlib
+
+from django.contrib import messages
+from django.middleware.csrf import get_token
+
+from . import cache, schedule
+from .models import Post
+
+
+def _weak_etag(*parts):
+    digest = hashlib.sha1(
+        ':'.join(str(part) for part in parts).encode()
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _has_messages(request):
+    return bool(len(messages.get_messages(request)))
+
+
+def _csrf_token(request):
+    """
+    CSRF-токен из cookie, от которого зависят токены в страницах.
+    get_token() заводит его заранее, если cookie ещё нет (сам он каждый
+    раз возвращает новую маску). У гостя форм на этих страницах нет.
+    """
+    if not request.user.is_authenticated:
+        return None
+    get_token(request)
+    return request.META['CSRF_COOKIE']
+
+
+def _get_post_state(request, post_id):
+    """
+    Поля поста для валидаторов; один запрос на оба валидатора,
+    результат запоминается на объекте запроса.
+    """
+    if not hasattr(request, '_blog_post_state'):
+        request._blog_post_state = Post.objects.filter(pk=post_id).values(
+            'updated_at', 'category_id', 'location_id', 'author_id'
+        ).first()
+    return request._blog_post_state
+
+
+def post_detail_last_modified(request, post_id):
+    """
+    Время изменения поста. Комментарии обновляют Post.updated_at
+    через сигналы, поэтому отдельный запрос к ним не нужен.
+    Вошедшему пользователю не отдаётся: по дате не видно смены
+    CSRF-токена, проверка идёт только по ETag.
+    """
+    if request.user.is_authenticated:
+        return None
+    post = _get_post_state(request, post_id)
+    return post['updated_at'] if post else None
+
+
+def post_detail_etag(request, post_id):
+    if _has_messages(request):
+        return None
+    post = _get_post_state(request, post_id)
+    if post is None:
+        return None
+    return _weak_etag(
+        post_id,
+        post['updated_at'].isoformat(),
+        cache.get_versions(
+            ('category', post['category_id']),
+            ('location', post['location_id']),
+            ('user', post['author_id']),
+        ),
+        request.user.pk,
+        _csrf_token(request),
+    )
+
+
+def feed_etag(scope):
+    """
+    Валидатор ленты. В ETag входят версии её кэша (меняются сигналами
+    при правке постов, комментариев, категорий и мест) и дата ближайшей
+    отложенной публикации, которая сменится в момент выхода поста.
+    Last-Modified для лент не отдаётся: по max(updated_at) не видно
+    удалённых постов.
+    """
+    def etag(request, **kwargs):
+        if _has_messages(request):
+            return None
+        return _weak_etag(
+            cache.feed_versions(scope(**kwargs)),
+            cache.page_params(request),
+            schedule.next_pub_date(),
+            request.user.pk,
+            _csrf_token(request),
+        )
+    return etag
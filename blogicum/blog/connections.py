@@ -0,0 +1,49 @@
+"""
+Настройка соединений с базой данных.
+
+apply_sqlite_pragmas выполняет BLOG_SQLITE_PRAGMAS при открытии каждого
+соединения с SQLite: режим журнала WAL не даёт писателям
+(add_comment) блокировать читателей, synchronous=NORMAL в режиме WAL
+не теряет целостность при сбое, mmap_size читает файл базы через
+отображение в память, busy_timeout ждёт блокировку вместо ошибки
+«database is locked».
+
+close_broken_connections — проверка постоянных соединений
+(CONN_MAX_AGE) перед запросом: в Django 3.2 нет CONN_HEALTH_CHECKS, и
+соединение, оборванное сервером базы, иначе уронит первый запрос.
+"""
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+
+PRAGMA_VALUE_RE = re.compile(r'-?\w+')
+
+
+def sqlite_pragmas():
+    """Список PRAGMA из BLOG_SQLITE_PRAGMAS в порядке настройки."""
+    statements = []
+    for name, value in getattr(settings, 'BLOG_SQLITE_PRAGMAS', {}).items():
+        if not (name.isidentifier()
+                and PRAGMA_VALUE_RE.fullmatch(str(value))):
+            raise ImproperlyConfigured(
+                f'Недопустимая PRAGMA в BLOG_SQLITE_PRAGMAS: {name}={value}'
+            )
+        statements.append(f'PRAGMA {name} = {value}')
+    return statements
+
+
+def apply_sqlite_pragmas(connection):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for statement in sqlite_pragmas():
+            cursor.execute(statement)
+
+
+def close_broken_connections():
+    """Закрывает открытые соединения, которые перестали отвечать."""
+    for connection in connections.all():
+        if connection.connection is not None and not connection.is_usable():
+            connection.close()
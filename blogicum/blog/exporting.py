@@ -0,0 +1,94 @@
+"""
+Потоковая выгрузка постов и комментариев в JSON Lines или CSV.
+
+Строки читаются через QuerySet.iterator() порциями и сразу пишутся в
+поток, поэтому память не зависит от числа строк. Используется
+командой export_blog и действиями админки.
+"""
+import csv
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from .models import Comment, Post
+
+CHUNK_SIZE = 2000
+EXPORT_FIELDS = {
+    Post: (
+        'id', 'title', 'text', 'pub_date', 'author_id', 'category_id',
+        'location_id', 'image', 'is_published', 'created_at',
+        'updated_at', 'comment_count',
+    ),
+    Comment: (
+        'id', 'post_id', 'author_id', 'text', 'is_published', 'created_at',
+    ),
+}
+CONTENT_TYPES = {
+    'jsonl': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+class _Echo:
+    """Псевдофайл для csv.writer: write() возвращает строку."""
+
+    def write(self, value):
+        return value
+
+
+def _jsonl_lines(fields, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(fields, row))) + '\n'
+
+
+def _csv_lines(fields, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+FORMATS = {
+    'jsonl': _jsonl_lines,
+    'csv': _csv_lines,
+}
+
+
+def export_lines(queryset, format='jsonl', chunk_size=CHUNK_SIZE):
+    """Строки выгрузки queryset в порядке pk."""
+    fields = EXPORT_FIELDS[queryset.model]
+    rows = queryset.order_by('pk').values_list(*fields).iterator(
+        chunk_size=chunk_size
+    )
+    return FORMATS[format](fields, rows)
+
+
+def gzip_chunks(lines, level=6):
+    """Сжимает поток строк в gzip по мере чтения."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for line in lines:
+        chunk = compressor.compress(line.encode())
+        if chunk:
+            yield chunk
+    yield compressor.flush()
+
+
+def export_response(queryset, format='jsonl', compress=False):
+    """Ответ-файл с выгрузкой для действий админки."""
+    lines = export_lines(queryset, format)
+    filename = f'{queryset.model._meta.model_name}s.{format}'
+    content = (line.encode() for line in lines)
+    if compress:
+        content = gzip_chunks(lines)
+        filename += '.gz'
+    response = StreamingHttpResponse(
+        content,
+        content_type=(
+            'application/gzip' if compress else
+            f'{CONTENT_TYPES[format]}; charset=utf-8'
+        ),
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
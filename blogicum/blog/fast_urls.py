@@ -0,0 +1,139 @@
+"""
+Быстрое построение адресов блога.
+
+reverse() на каждый вызов перебирает варианты шаблонов адреса и
+проверяет аргументы регулярными выражениями; карточка поста строит
+четыре адреса, страница ленты — около сорока. Здесь адреса маршрутов
+из blog/urls.py один раз превращаются в строки формата вида
+'posts/{0}/', и дальше адрес — это преобразование аргументов
+конвертером маршрута и str.format.
+
+Шаблоны строятся самим reverse() с подставленными метками, поэтому
+совпадают с ним, в том числе с префиксом include(). Значения, которые
+не проходят проверку конвертера, отдаются reverse(): он и бросит
+NoReverseMatch.
+
+get_urlconf() и get_script_prefix() хранятся в asgiref.Local, и каждое
+чтение стоит дороже самого форматирования. Поэтому шаблоны строятся по
+ROOT_URLCONF (urlconf на уровне запроса не поддерживается), а префикс
+скрипта запоминается в начале запроса.
+"""
+import re
+from contextvars import ContextVar
+from urllib.parse import quote
+
+from django.core.signals import (
+    request_finished, request_started, setting_changed
+)
+from django.dispatch import receiver
+from django.urls import get_script_prefix, reverse
+from django.utils.http import RFC3986_SUBDELIMS
+
+NAMESPACE = 'blog'
+# Те же безопасные символы, что у reverse().
+SAFE_CHARS = RFC3986_SUBDELIMS + '/~:@'
+
+_routes = {}
+# Префикс скрипта текущего запроса; None вне запроса.
+_script_prefix = ContextVar('blog_url_script_prefix', default=None)
+
+
+def script_prefix():
+    prefix = _script_prefix.get()
+    return get_script_prefix() if prefix is None else prefix
+
+
+@receiver(request_started)
+def remember_script_prefix(sender, **kwargs):
+    # Обработчик запроса вызывает set_script_prefix() до этого сигнала.
+    _script_prefix.set(get_script_prefix())
+
+
+@receiver(request_finished)
+def forget_script_prefix(sender, **kwargs):
+    _script_prefix.set(None)
+
+
+class Route:
+    """Адрес маршрута как строка формата и конвертеры его аргументов."""
+
+    def __init__(self, name, converters):
+        self.name = name
+        self.params = list(converters)
+        self.converters = [converters[param] for param in self.params]
+        self.regexes = [
+            re.compile(converter.regex) for converter in self.converters
+        ]
+        markers = {
+            param: self._marker(number, converter)
+            for number, (param, converter)
+            in enumerate(converters.items())
+        }
+        url = reverse(f'{NAMESPACE}:{name}', kwargs=markers)
+        url = url[len(get_script_prefix()):]
+        url = url.replace('{', '{{').replace('}', '}}')
+        for number, param in enumerate(self.params):
+            url = url.replace(str(markers[param]), f'{{{number}}}')
+        self.format = url
+
+    @staticmethod
+    def _marker(number, converter):
+        """Значение-метка, которое пройдёт проверку конвертера."""
+        if converter.regex == '[0-9]+':
+            return 987654321000 + number
+        return f'blogurlmarker{number}x'
+
+    def build(self, args, kwargs):
+        if kwargs:
+            if set(kwargs) != set(self.params):
+                return None
+            args = [kwargs[param] for param in self.params]
+        values = []
+        for value, converter, regex in zip(
+                args, self.converters, self.regexes):
+            value = str(converter.to_url(value))
+            if not regex.fullmatch(value):
+                return None
+            values.append(quote(value, safe=SAFE_CHARS))
+        if len(values) != len(self.params):
+            return None
+        return script_prefix() + self.format.format(*values)
+
+
+def _get_routes():
+    if not _routes:
+        from . import urls
+        _routes.update(
+            (pattern.name, Route(pattern.name, pattern.pattern.converters))
+            for pattern in urls.urlpatterns if pattern.name
+        )
+    return _routes
+
+
+@receiver(setting_changed)
+def clear(setting=None, **kwargs):
+    """Сбрасывает построенные шаблоны; вызывается при смене ROOT_URLCONF."""
+    if setting in (None, 'ROOT_URLCONF'):
+        _routes.clear()
+
+
+def blog_url(name, *args, **kwargs):
+    """
+    Адрес маршрута блога; имя — с пространством имён 'blog:' или без.
+    Вызов с аргументами post_detail и post.pk даёт то же, что
+    reverse('blog:post_detail', args=[post.pk]).
+    """
+    if name.startswith(f'{NAMESPACE}:'):
+        name = name[len(NAMESPACE) + 1:]
+    route = _get_routes().get(name)
+    url = route.build(args, kwargs) if route else None
+    if url is None:
+        return reverse(
+            f'{NAMESPACE}:{name}', args=args or None, kwargs=kwargs or None
+        )
+    return url
+
+
+def profile_url(user):
+    """Адрес профиля; User.get_absolute_url (ABSOLUTE_URL_OVERRIDES)."""
+    return blog_url('profile', user.username)
@@ -0,0 +1,152 @@
+"""
+Уменьшенные копии картинок постов.
+
+Для каждой загруженной картинки создаются копии фиксированной ширины в
+JPEG и WebP в каталоге post_images/thumbs/. Имена копий выводятся из
+полного имени оригинала (с расширением: у photo.png и photo.jpg разные
+копии), а список готовых ширин хранится в Post.thumbnails,
+поэтому шаблонам не нужно обращаться к хранилищу. Пока список пуст,
+шаблоны показывают оригинал. Копии создаёт фоновая задача post_image
+(см. blog.jobs), а не запрос, загрузивший картинку; при замене картинки
+и удалении поста старые копии удаляются (см. blog.signals).
+"""
+import logging
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from . import cache, jobs
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+# Карточка и страница поста шириной 40rem: 1x, 2x и узкие экраны.
+WIDTHS = (320, 640, 1280)
+SIZES = '(max-width: 40rem) 100vw, 40rem'
+THUMBS_DIR = 'thumbs'
+POST_IMAGE_TASK = 'post_image'
+FORMATS = {
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+}
+
+
+class ImageError(Exception):
+    """Оригинал не удалось прочитать как картинку."""
+
+
+def thumbnail_name(name, width, extension):
+    """post_images/photo.png -> post_images/thumbs/photo.png_640.webp"""
+    directory, filename = posixpath.split(name)
+    return posixpath.join(
+        directory, THUMBS_DIR, f'{filename}_{width}.{extension}'
+    )
+
+
+def target_widths(original_width):
+    """Ширины копий: без увеличения, но не меньше одной копии."""
+    widths = [width for width in WIDTHS if width < original_width]
+    if len(widths) < len(WIDTHS):
+        widths.append(min(original_width, WIDTHS[-1]))
+    return widths
+
+
+def make_thumbnails(name, storage=default_storage):
+    """
+    Создаёт копии картинки name и возвращает список их ширин.
+    Существующие копии с теми же именами перезаписываются.
+    """
+    try:
+        with storage.open(name) as original:
+            image = Image.open(original)
+            image = ImageOps.exif_transpose(image)
+            image.load()
+    except (OSError, UnidentifiedImageError) as error:
+        raise ImageError(f'{name}: {error}') from error
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    widths = target_widths(image.width)
+    for width in widths:
+        height = max(round(image.height * width / image.width), 1)
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        for extension, (pil_format, options) in FORMATS.items():
+            buffer = BytesIO()
+            resized.save(buffer, format=pil_format, **options)
+            path = thumbnail_name(name, width, extension)
+            if storage.exists(path):
+                storage.delete(path)
+            storage.save(path, ContentFile(buffer.getvalue()))
+    return widths
+
+
+def delete_thumbnails(name, widths, storage=default_storage):
+    """Удаляет копии картинки name перечисленных ширин."""
+    for width in widths:
+        for extension in FORMATS:
+            path = thumbnail_name(name, width, extension)
+            if storage.exists(path):
+                storage.delete(path)
+
+
+def delete_unused_thumbnails(name, widths, storage=default_storage):
+    """
+    Удаляет копии картинки name, если её не показывает ни один пост:
+    одну картинку могут делить несколько постов (например, от seed_blog).
+    """
+    if Post.objects.filter(image=name).exists():
+        return
+    delete_thumbnails(name, widths, storage)
+
+
+def srcset(name, widths, extension, storage=default_storage):
+    return ', '.join(
+        f'{storage.url(thumbnail_name(name, width, extension))} {width}w'
+        for width in widths
+    )
+
+
+def process_post_image(post_id):
+    """
+    Создаёт копии картинки поста и записывает их ширины в
+    Post.thumbnails. Возвращает список ширин.
+    """
+    post = Post.objects.filter(pk=post_id).values(
+        'image', 'category__slug', 'author__username'
+    ).first()
+    if post is None or not post['image']:
+        return []
+    name = post['image']
+    storage = Post._meta.get_field('image').storage
+    widths = make_thumbnails(name, storage)
+    # Картинку могли заменить, пока шла обработка.
+    updated = Post.objects.filter(pk=post_id, image=name).update(
+        thumbnails=widths, updated_at=timezone.now()
+    )
+    if updated:
+        cache.bump_version('post', post_id)
+        cache.purge_post_feeds(
+            post['category__slug'], post['author__username']
+        )
+    else:
+        # Копии, возможно, уже никому не нужны, а сигналы о них не знают.
+        delete_unused_thumbnails(name, widths, storage)
+    return widths
+
+
+@jobs.task(POST_IMAGE_TASK)
+def build_post_image(post_id):
+    """
+    Фоновая задача: копии картинки поста. Нечитаемая картинка — не
+    повод для повтора, карточка просто останется с оригиналом.
+    """
+    try:
+        process_post_image(post_id)
+    except ImageError:
+        logger.warning(
+            'Не удалось обработать картинку поста %s', post_id, exc_info=True
+        )
@@ -0,0 +1,141 @@
+"""
+Очередь фоновых задач в базе данных.
+
+Задачи — строки модели Job. Воркер (команда run_worker) забирает
+задачи условным UPDATE по статусу, поэтому несколько воркеров не
+выполнят одну задачу дважды; отдельный брокер не нужен. Упавшая задача
+повторяется с растущей задержкой, пока не кончатся попытки.
+
+Обработчики регистрируются декоратором task:
+
+    @jobs.task('post_image')
+    def build_post_image(post_id):
+        ...
+
+    jobs.enqueue('post_image', post.pk)
+"""
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+# Задержка перед повтором: RETRY_DELAY * 2 ** (попытка - 1) секунд.
+RETRY_DELAY = 30
+# Задача в статусе running дольше этого считается брошенной воркером.
+STALE_AFTER = timedelta(minutes=10)
+
+
+def task(name):
+    """Регистрирует обработчик задачи под именем name."""
+    def decorator(func):
+        TASKS[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, *args, max_attempts=3, delay=0):
+    """
+    Ставит задачу в очередь. Строка пишется в текущей транзакции, так
+    что воркер не увидит задачу раньше, чем сохранятся её данные.
+    С BLOG_JOBS_EAGER задача выполняется сразу после коммита.
+    """
+    if name not in TASKS:
+        raise KeyError(f'Неизвестная задача: {name}')
+    job = Job.objects.create(
+        task=name,
+        args=list(args),
+        max_attempts=max_attempts,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+    if getattr(settings, 'BLOG_JOBS_EAGER', False):
+        transaction.on_commit(lambda: run_pending(limit=None))
+    return job
+
+
+def release_stale():
+    """
+    Возвращает в очередь задачи, брошенные упавшим воркером; возвращает
+    их число. Задача, исчерпавшая попытки, помечается упавшей: если
+    воркер падает именно на ней, повтор уронил бы его снова.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status=Job.RUNNING, locked_at__lt=now - STALE_AFTER
+    )
+    stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Job.FAILED,
+        locked_at=None,
+        last_error='Воркер не завершил задачу за все попытки.',
+        finished_at=now,
+    )
+    return stale.update(status=Job.PENDING, locked_at=None)
+
+
+def claim_jobs(limit=10):
+    """Забирает до limit готовых к запуску задач и отдаёт их по одной."""
+    now = timezone.now()
+    candidates = Job.objects.filter(
+        status=Job.PENDING, run_after__lte=now
+    ).order_by('run_after', 'pk').values_list('pk', flat=True)
+    if limit is not None:
+        candidates = candidates[:limit]
+    for pk in list(candidates):
+        claimed = Job.objects.filter(pk=pk, status=Job.PENDING).update(
+            status=Job.RUNNING,
+            attempts=F('attempts') + 1,
+            locked_at=now,
+        )
+        if claimed:
+            yield Job.objects.get(pk=pk)
+
+
+def run_job(job):
+    """Выполняет задачу и записывает результат; True при успехе."""
+    handler = TASKS.get(job.task)
+    try:
+        if handler is None:
+            raise KeyError(f'Неизвестная задача: {job.task}')
+        handler(*job.args)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning('Задача %s упала (попытка %s)', job, job.attempts,
+                       exc_info=True)
+        if job.attempts < job.max_attempts:
+            delay = RETRY_DELAY * 2 ** (job.attempts - 1)
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.PENDING,
+                locked_at=None,
+                last_error=error,
+                run_after=timezone.now() + timedelta(seconds=delay),
+            )
+        else:
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.FAILED,
+                last_error=error,
+                finished_at=timezone.now(),
+            )
+        return False
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.DONE, finished_at=timezone.now()
+    )
+    return True
+
+
+def run_pending(limit=10):
+    """Выполняет готовые задачи; возвращает (успешных, упавших)."""
+    done = failed = 0
+    for job in claim_jobs(limit):
+        if run_job(job):
+            done += 1
+        else:
+            failed += 1
+    return done, failed
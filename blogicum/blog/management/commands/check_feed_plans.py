@@ -0,0 +1,57 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from blog.models import Category, Post, User
+from blog.views import get_published_posts, get_user_posts
+
+FULL_SCAN_PATTERNS = {
+    'sqlite': r'\bSCAN (?:TABLE )?{table}\b(?! USING)',
+    'postgresql': r'\bSeq Scan on {table}\b',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет EXPLAIN для запросов лент (главная, категория, профиль) '
+        'и завершается с ошибкой, если таблица публикаций читается '
+        'полным сканированием.'
+    )
+
+    def get_querysets(self):
+        author = User.objects.order_by('pk').first() or User(pk=0)
+        category = Category.objects.order_by('pk').first() or Category(pk=0)
+        return {
+            'index': get_published_posts(),
+            'category_posts': get_published_posts().filter(
+                category=category
+            ),
+            'profile': get_user_posts(author),
+            'profile (автор)': get_user_posts(author, viewer=author),
+        }
+
+    def handle(self, *args, **options):
+        pattern = FULL_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(
+                f'Проверка планов для СУБД {connection.vendor} '
+                'не поддерживается.'
+            )
+        full_scan = re.compile(
+            pattern.format(table=re.escape(Post._meta.db_table))
+        )
+        failed = []
+        for name, queryset in self.get_querysets().items():
+            plan = queryset[:10].explain()
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{name}:\n{plan}\n')
+            if full_scan.search(plan):
+                failed.append(name)
+                self.stderr.write(f'{name}: полное сканирование\n{plan}')
+            else:
+                self.stdout.write(f'{name}: OK')
+        if failed:
+            raise CommandError(
+                'Полное сканирование таблицы публикаций: ' + ', '.join(failed)
+            )
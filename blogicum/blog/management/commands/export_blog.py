@@ -0,0 +1,89 @@
+import gzip
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.exporting import CHUNK_SIZE, FORMATS, export_lines
+from blog.models import Comment, Post
+
+MODELS = {
+    'posts': Post,
+    'comments': Comment,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоковая выгрузка постов или комментариев в JSON Lines или CSV '
+        'с постоянным расходом памяти.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=MODELS)
+        parser.add_argument(
+            '--format', choices=FORMATS, default='jsonl'
+        )
+        parser.add_argument(
+            '-o', '--output', default='-',
+            help='Файл выгрузки; «-» — стандартный вывод. '
+                 'Файлы с расширением .gz сжимаются.'
+        )
+        parser.add_argument(
+            '--gzip', action='store_true',
+            help='Сжать выгрузку gzip независимо от расширения.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=CHUNK_SIZE,
+            help='Сколько строк читать из базы за раз.'
+        )
+        parser.add_argument(
+            '--published', action='store_true',
+            help='Только опубликованные записи.'
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size должен быть больше нуля.')
+        queryset = MODELS[options['model']].objects.all()
+        if options['published']:
+            queryset = queryset.filter(is_published=True)
+        lines = export_lines(
+            queryset, options['format'], options['chunk_size']
+        )
+        output = options['output']
+        compress = options['gzip'] or output.endswith('.gz')
+        start = time.perf_counter()
+        stream = self.open_output(output, compress)
+        written = 0
+        try:
+            for line in lines:
+                if stream is None:
+                    self.stdout.write(line, ending='')
+                else:
+                    stream.write(line)
+                written += 1
+        finally:
+            if stream is not None:
+                stream.close()
+        # У CSV первая строка — заголовок.
+        rows = written - 1 if options['format'] == 'csv' else written
+        seconds = time.perf_counter() - start
+        rate = rows / seconds if seconds else 0
+        self.stderr.write(self.style.SUCCESS(
+            f'Выгружено: {rows} строк за {seconds:.2f} с '
+            f'({rate:.0f} строк/с)'
+        ))
+
+    def open_output(self, output, compress):
+        """Файл для записи; None — несжатый стандартный вывод."""
+        try:
+            if output == '-' and not compress:
+                return None
+            if output == '-':
+                return gzip.open(sys.stdout.buffer, 'wt', encoding='utf-8')
+            if compress:
+                return gzip.open(output, 'wt', encoding='utf-8')
+            return open(output, 'w', encoding='utf-8', newline='')
+        except OSError as error:
+            raise CommandError(f'Не удалось открыть {output}: {error}')
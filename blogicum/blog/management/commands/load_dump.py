@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.base import DeserializationError
+from django.db import DEFAULT_DB_ALIAS, IntegrityError
+
+from blog.loading import load_dump
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоковая загрузка JSON-дампов в формате dumpdata: объекты '
+        'читаются по одному и вставляются пачками в одной транзакции. '
+        'Подходит для дампов, которые не помещаются в память.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths', nargs='+',
+            help='Файлы дампов (.json, .json.gz, .json.bz2, .json.xz).'
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '-e', '--exclude', action='append', default=[],
+            help='Пропустить приложение или модель (app_label.Model).'
+        )
+        parser.add_argument(
+            '--ignore-conflicts', action='store_true',
+            help='Пропускать строки, уже существующие в базе.'
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        try:
+            stats = load_dump(
+                options['paths'],
+                batch_size=options['batch_size'],
+                exclude=options['exclude'],
+                ignore_conflicts=options['ignore_conflicts'],
+                using=options['database'],
+            )
+        except (OSError, ValueError, DeserializationError,
+                IntegrityError) as error:
+            raise CommandError(f'Дамп не загружен: {error}')
+        total_rows = total_time = 0
+        for name, (rows, seconds) in stats.items():
+            rate = rows / seconds if seconds else 0
+            self.stdout.write(
+                f'{name:<22} {rows:>10} строк  {seconds:8.2f} с  '
+                f'{rate:>10.0f} строк/с'
+            )
+            if name not in ('constraints', 'comment_count'):
+                total_rows += rows
+            total_time += seconds
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено: {total_rows} строк за {total_time:.2f} с'
+        ))
@@ -0,0 +1,88 @@
+import json
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+METRICS = ('queries', 'duplicates', 'sql_ms', 'template_ms', 'total_ms')
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values, rank):
+    """Перцентиль методом ближайшего ранга; values отсортированы."""
+    index = max(int(round(rank / 100 * len(values))) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+def read_samples(log_path):
+    """Значения метрик из журнала, сгруппированные по вьюхам."""
+    samples = defaultdict(lambda: defaultdict(list))
+    with open(log_path, encoding='utf-8') as log:
+        for line in log:
+            entry = json.loads(line)
+            for metric in METRICS:
+                samples[entry['view']][metric].append(entry[metric])
+    return samples
+
+
+def build_report(samples):
+    """Число запросов и перцентили каждой метрики по вьюхам."""
+    report = {}
+    for view, metrics in sorted(samples.items()):
+        report[view] = {'requests': len(metrics['queries'])}
+        for metric, values in metrics.items():
+            values.sort()
+            report[view][metric] = {
+                f'p{rank}': percentile(values, rank) for rank in PERCENTILES
+            }
+    return report
+
+
+class Command(BaseCommand):
+    help = (
+        'Сводка журнала QueryBudgetMiddleware: число запросов, время SQL, '
+        'рендера шаблонов и всего ответа по вьюхам (p50/p95/p99).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--log',
+            default=getattr(settings, 'BLOG_QUERY_BUDGET_LOG', None),
+            help='Путь к журналу; по умолчанию BLOG_QUERY_BUDGET_LOG.'
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Вывести сводку в формате JSON.'
+        )
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Очистить журнал после вывода сводки.'
+        )
+
+    def handle(self, *args, **options):
+        if not options['log']:
+            raise CommandError('Не задан путь к журналу.')
+        log_path = Path(options['log'])
+        if not log_path.exists():
+            raise CommandError(f'Журнал {log_path} не найден.')
+
+        report = build_report(read_samples(log_path))
+        if options['json']:
+            self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
+        else:
+            self.write_table(report)
+
+        if options['reset']:
+            log_path.write_text('')
+
+    def write_table(self, report):
+        for view, row in report.items():
+            self.stdout.write(f'{view} ({row["requests"]} запросов)')
+            for metric in METRICS:
+                values = ' '.join(
+                    f'{name}={value}' for name, value in row[metric].items()
+                )
+                self.stdout.write(f'  {metric:<12} {values}')
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает денормализованный счётчик комментариев '
+        'Post.comment_count по опубликованным комментариям.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'post_ids',
+            nargs='*',
+            type=int,
+            help='id публикаций; без аргументов пересчитываются все.'
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.all()
+        if options['post_ids']:
+            posts = posts.filter(pk__in=options['post_ids'])
+        updated = posts.recount_comments()
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитано публикаций: {updated}'
+        ))
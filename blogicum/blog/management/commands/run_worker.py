@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from blog import jobs
+
+
+class Command(BaseCommand):
+    help = (
+        'Воркер фоновых задач из таблицы blog_job: создание копий картинок '
+        'и т. п. Можно запускать несколько воркеров одновременно.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить готовые задачи и выйти.'
+        )
+        parser.add_argument(
+            '--batch', type=int, default=10,
+            help='Сколько задач забирать за раз.'
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=2.0,
+            help='Пауза в секундах, когда очередь пуста.'
+        )
+
+    def handle(self, *args, **options):
+        total_done = total_failed = 0
+        try:
+            while True:
+                close_old_connections()
+                released = jobs.release_stale()
+                if released:
+                    self.stdout.write(
+                        f'Возвращено в очередь брошенных задач: {released}'
+                    )
+                done, failed = jobs.run_pending(options['batch'])
+                total_done += done
+                total_failed += failed
+                if done or failed:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(
+            f'Выполнено задач: {total_done}, с ошибкой: {total_failed}'
+        ))
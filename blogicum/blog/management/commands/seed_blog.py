@@ -0,0 +1,74 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.seeding import parse_distribution, seed_blog
+
+
+def distribution(spec):
+    parse_distribution(spec)
+    return spec
+
+
+def share(value):
+    value = float(value)
+    if not 0 <= value <= 1:
+        raise ValueError(value)
+    return value
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу синтетическими пользователями, постами и '
+        'комментариями через bulk_create. Распределения: fixed:N, '
+        'uniform:A:B, exp:MEAN, pareto:ALPHA:MIN.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--locations', type=int, default=20)
+        parser.add_argument(
+            '--posts-per-author', type=distribution, default='uniform:0:20'
+        )
+        parser.add_argument(
+            '--comments-per-post', type=distribution, default='exp:5'
+        )
+        parser.add_argument(
+            '--unpublished', type=share, default=0.05,
+            help='Доля снятых с публикации постов.'
+        )
+        parser.add_argument(
+            '--future', type=share, default=0.02,
+            help='Доля постов с датой публикации в будущем.'
+        )
+        parser.add_argument(
+            '--with-image', type=share, default=0.0,
+            help='Доля постов с картинкой.'
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--prefix', default='seed')
+
+    def handle(self, *args, **options):
+        options = {
+            key: options[key] for key in (
+                'users', 'categories', 'locations', 'posts_per_author',
+                'comments_per_post', 'unpublished', 'future', 'with_image',
+                'batch_size', 'seed', 'prefix',
+            )
+        }
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        stats = seed_blog(**options)
+        total_rows = total_time = 0
+        for name, (rows, seconds) in stats.items():
+            rate = rows / seconds if seconds else 0
+            self.stdout.write(
+                f'{name:<14} {rows:>10} строк  {seconds:8.2f} с  '
+                f'{rate:>10.0f} строк/с'
+            )
+            if name not in ('comment_count', 'search_index'):
+                total_rows += rows
+                total_time += seconds
+        self.stdout.write(self.style.SUCCESS(
+            f'Всего: {total_rows} строк за {total_time:.2f} с'
+        ))
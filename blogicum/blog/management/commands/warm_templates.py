@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.warmup import warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Компилирует все шаблоны из templates/: проверка синтаксиса перед '
+        'деплоем и прогрев кэширующего загрузчика.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--app-dirs', action='store_true',
+            help='Также шаблоны из каталогов templates/ приложений.'
+        )
+
+    def handle(self, *args, **options):
+        loaded, errors = warm_templates(app_dirs=options['app_dirs'])
+        for name, error in errors:
+            self.stderr.write(f'{name}: {error}')
+        if errors:
+            raise CommandError(f'Шаблонов с ошибками: {len(errors)}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Скомпилировано шаблонов: {loaded}'
+        ))
@@ -0,0 +1,249 @@
+"""
+Middleware блога.
+
+QueryBudgetMiddleware включается настройкой BLOG_QUERY_BUDGET. Для каждого
+запроса она считает SQL-запросы, их суммарное время, время рендера
+шаблонов и повторяющиеся запросы, отдаёт это в заголовке Server-Timing
+и дописывает строку в журнал BLOG_QUERY_BUDGET_LOG. Сводку с
+перцентилями печатает команда query_budget_report. Время рендера
+считают шаблоны движка blog.template_backends.TimedDjangoTemplates
+(см. TEMPLATES в settings.py). Соединения с базой
+у каждого потока свои, поэтому вьюхи, которые сами уходят в другой поток
+(blog.async_views), считают свои запросы через count_queries().
+
+ReplicaMiddleware выбирает базу для чтения: см. blog.routers.
+StaticAssetsMiddleware отдаёт собранную статику.
+"""
+import asyncio
+import json
+import mimetypes
+import random
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.db import connections
+from django.http import FileResponse, Http404
+from django.utils._os import safe_join
+from django.utils.deprecation import MiddlewareMixin
+
+from . import routers
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# Сжатые копии статики в порядке предпочтения.
+STATIC_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+# Имя с хешем меняется вместе с содержимым: кэшировать можно навсегда.
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+STATIC_CACHE = 'public, max-age=3600'
+
+_current_stats = ContextVar('blog_query_budget_stats', default=None)
+
+
+class RequestStats:
+    def __init__(self):
+        self.queries = []
+        self.sql_time = 0.0
+        self.template_time = 0.0
+
+    @property
+    def duplicates(self):
+        """Число лишних запросов: одинаковый SQL с одинаковыми параметрами."""
+        counts = Counter(self.queries)
+        return sum(count - 1 for count in counts.values())
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.queries.append((sql, repr(params)))
+
+
+def current_stats():
+    """Статистика текущего запроса или None вне QueryBudgetMiddleware."""
+    return _current_stats.get()
+
+
+@contextmanager
+def count_queries():
+    """
+    Учитывает запросы текущего потока в статистике запроса, если её
+    ведёт QueryBudgetMiddleware.
+    """
+    stats = current_stats()
+    with ExitStack() as stack:
+        if stats is not None:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(stats.record_query)
+                )
+        yield
+
+
+class QueryBudgetMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'BLOG_QUERY_BUDGET', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.log_path = getattr(settings, 'BLOG_QUERY_BUDGET_LOG', None)
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            with count_queries():
+                response = self.get_response(request)
+        finally:
+            _current_stats.reset(token)
+        total_time = time.perf_counter() - start
+
+        match = request.resolver_match
+        view_name = match.view_name if match else request.path
+        response['Server-Timing'] = (
+            f'db;dur={stats.sql_time * 1000:.1f};'
+            f'desc="{len(stats.queries)} queries", '
+            f'dup;desc="{stats.duplicates} duplicate queries", '
+            f'tpl;dur={stats.template_time * 1000:.1f}, '
+            f'total;dur={total_time * 1000:.1f}'
+        )
+        if self.log_path:
+            self.write_log({
+                'view': view_name,
+                'status': response.status_code,
+                'queries': len(stats.queries),
+                'duplicates': stats.duplicates,
+                'sql_ms': round(stats.sql_time * 1000, 3),
+                'template_ms': round(stats.template_time * 1000, 3),
+                'total_ms': round(total_time * 1000, 3),
+            })
+        return response
+
+    def write_log(self, entry):
+        with open(self.log_path, 'a', encoding='utf-8') as log:
+            log.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+class ReplicaMiddleware(MiddlewareMixin):
+    """
+    Выбирает базу для чтения в запросе (см. blog.routers) и после
+    изменяющих запросов закрепляет браузер за основной базой.
+    MiddlewareMixin: под ASGI весь запрос не уходит в общий поток.
+    """
+
+    def __init__(self, get_response):
+        if not routers.read_replicas():
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def process_request(self, request):
+        routers.use_replica(None)
+
+    def process_response(self, request, response):
+        routers.use_replica(None)
+        if request.method not in SAFE_METHODS:
+            response.set_cookie(
+                routers.PIN_COOKIE, '1',
+                max_age=getattr(settings, 'BLOG_REPLICA_PIN_SECONDS', 10),
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (getattr(view_func, 'replica_reads', False)
+                and request.method in SAFE_METHODS
+                and routers.PIN_COOKIE not in request.COOKIES):
+            routers.use_replica(random.choice(routers.read_replicas()))
+
+
+class StaticAssetsMiddleware:
+    """
+    Отдаёт статику из STATIC_ROOT самим приложением, без CDN и отдельного
+    веб-сервера (BLOG_SERVE_STATIC). Файлы с хешем в имени кэшируются
+    браузером на год, сжатая копия (.br, .gz, см. blog.storage) выбирается
+    по Accept-Encoding.
+
+    Работает и в синхронной, и в асинхронной цепочке: под ASGI файл
+    открывается в пуле потоков, как в ASGIStaticFilesHandler, а
+    остальные запросы проходят дальше без перехода в общий поток.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'BLOG_SERVE_STATIC', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Как в MiddlewareMixin: обработчик увидит асинхронный вызов.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+        self.prefix = settings.STATIC_URL
+        self.root = Path(settings.STATIC_ROOT)
+        self.immutable = set(self.manifest_paths())
+
+    def manifest_paths(self):
+        """Имена файлов с хешем из манифеста collectstatic."""
+        manifest = self.root / ManifestStaticFilesStorage.manifest_name
+        if not manifest.exists():
+            return []
+        return json.loads(manifest.read_text()).get('paths', {}).values()
+
+    def static_name(self, request):
+        """Имя файла статики из адреса запроса или None."""
+        if (request.path.startswith(self.prefix)
+                and request.method in ('GET', 'HEAD')):
+            return request.path[len(self.prefix):]
+        return None
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        name = self.static_name(request)
+        if name is not None:
+            return self.serve(request, name)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        name = self.static_name(request)
+        if name is not None:
+            return await sync_to_async(self.serve, thread_sensitive=False)(
+                request, name
+            )
+        return await self.get_response(request)
+
+    def serve(self, request, name):
+        try:
+            path = Path(safe_join(self.root, name))
+        except SuspiciousFileOperation:
+            raise Http404(name)
+        if not path.is_file():
+            raise Http404(name)
+        content_type, _ = mimetypes.guess_type(name)
+        accepted = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        encoding = None
+        for candidate, suffix in STATIC_ENCODINGS:
+            compressed = path.with_name(path.name + suffix)
+            if candidate in accepted and compressed.is_file():
+                path, encoding = compressed, candidate
+                break
+        response = FileResponse(
+            path.open('rb'),
+            content_type=content_type or 'application/octet-stream'
+        )
+        del response['Content-Disposition']
+        if encoding:
+            response['Content-Encoding'] = encoding
+        response['Vary'] = 'Accept-Encoding'
+        response['Cache-Control'] = (
+            IMMUTABLE_CACHE if name in self.immutable else STATIC_CACHE
+        )
+        return response
@@ -0,0 +1,19 @@
+# Generated by Django 3.2.16 on 2026-10-18 04:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0004_remove_comment_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["-created_at"], name="blog_commen_created_1f5393_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.16 on 2026-10-18 04:50
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_comment_count(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    Comment = apps.get_model("blog", "Comment")
+    published_comments = (
+        Comment.objects.filter(post=OuterRef("pk"), is_published=True)
+        .order_by()
+        .values("post")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Post.objects.update(
+        comment_count=Coalesce(Subquery(published_comments), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0005_comment_created_at_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="comment_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Количество комментариев"
+            ),
+        ),
+        migrations.RunPython(fill_comment_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.16 on 2026-10-18 04:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0006_post_comment_count"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("is_published", True)),
+                fields=["-pub_date"],
+                name="post_published_feed_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("is_published", True)),
+                fields=["category", "-pub_date"],
+                name="post_category_feed_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["author", "-pub_date"], name="post_author_feed_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 3.2.16 on 2026-10-18 05:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0008_post_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["post", "-created_at"], name="comment_post_thread_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2.16 on 2026-10-18 05:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0009_comment_post_thread_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="thumbnails",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                editable=False,
+                help_text="Заполняется после обработки картинки.",
+                verbose_name="Ширины уменьшенных копий",
+            ),
+        ),
+    ]
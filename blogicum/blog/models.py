@@ -1,5 +1,10 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from .fast_urls import blog_url
 
 User = get_user_model()
 
@@ -35,6 +40,9 @@ class Category(models.Model):
     def __str__(self):
         return self.title
 
+    def get_absolute_url(self):
+        return blog_url('category_posts', self.slug)
+
 
 class Location(models.Model):
     name = models.CharField(
@@ -59,6 +67,24 @@ class Location(models.Model):
         return self.name
 
 
+class PostQuerySet(models.QuerySet):
+    def recount_comments(self, **extra_fields):
+        """
+        Пересчитывает поле comment_count по опубликованным комментариям.
+        extra_fields обновляются тем же запросом.
+        """
+        published_comments = Comment.objects.filter(
+            post=OuterRef('pk'),
+            is_published=True
+        ).order_by().values('post').annotate(
+            total=Count('pk')
+        ).values('total')
+        return self.update(
+            comment_count=Coalesce(Subquery(published_comments), 0),
+            **extra_fields
+        )
+
+
 class Post(models.Model):
     title = models.CharField(
         'Заголовок',
@@ -107,14 +133,54 @@ class Post(models.Model):
         'Добавлено',
         auto_now_add=True
     )
+    updated_at = models.DateTimeField(
+        'Изменено',
+        auto_now=True
+    )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False
+    )
+    thumbnails = models.JSONField(
+        'Ширины уменьшенных копий',
+        default=list,
+        blank=True,
+        editable=False,
+        help_text='Заполняется после обработки картинки.'
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
+        indexes = [
+            # Частичные индексы под get_published_posts(): главная
+            # страница и страница категории.
+            models.Index(
+                fields=['-pub_date'],
+                name='post_published_feed_idx',
+                condition=models.Q(is_published=True)
+            ),
+            models.Index(
+                fields=['category', '-pub_date'],
+                name='post_category_feed_idx',
+                condition=models.Q(is_published=True)
+            ),
+            # Профиль: get_user_posts(), в том числе для самого автора.
+            models.Index(
+                fields=['author', '-pub_date'],
+                name='post_author_feed_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def get_absolute_url(self):
+        return blog_url('post_detail', self.pk)
+
 
 class Comment(models.Model):
     text = models.TextField('Текст комментария')
@@ -136,17 +202,70 @@ class Comment(models.Model):
         help_text='Снимите галочку, чтобы скрыть комментарий.'
     )
     created_at = models.DateTimeField('Добавлено', auto_now_add=True)
-++  updated_at = models.DateTimeField('Обновлено', auto_now=True, blank=True, null=True)
 
     class Meta:
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ['created_at']
-++      indexes = [
-++          models.Index(fields=['-created_at']),
-++      ]
+        indexes = [
+            models.Index(fields=['-created_at']),
+            # Порции комментариев поста: get_comment_chunk().
+            models.Index(
+                fields=['post', '-created_at'],
+                name='comment_post_thread_idx'
+            ),
+        ]
+
+    def __str__(self):
+        # Обрезаем длинный текст для красивого отображения в админке
+        short_text = self.text[:50] + '...' if len(self.text) > 50 else self.text
+        return f'{self.author.username}: {short_text}'
+
+
+class Job(models.Model):
+    """Фоновая задача; выполняется командой run_worker, см. blog.jobs."""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Готово'),
+        (FAILED, 'Ошибка'),
+    )
+
+    task = models.CharField('Задача', max_length=64)
+    args = models.JSONField('Аргументы', default=list, blank=True)
+    status = models.CharField(
+        'Статус',
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    max_attempts = models.PositiveSmallIntegerField(
+        'Максимум попыток',
+        default=3
+    )
+    run_after = models.DateTimeField('Не раньше', default=timezone.now)
+    locked_at = models.DateTimeField('Взята в работу', null=True, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    finished_at = models.DateTimeField('Завершена', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        indexes = [
+            # Выборка очереди воркером: blog.jobs.claim_jobs().
+            models.Index(
+                fields=['run_after'],
+                name='job_pending_idx',
+                condition=models.Q(status='pending')
+            ),
+        ]
 
     def __str__(self):
-++      # Обрезаем длинный текст для красивого отображения в 
-++      short_text = self.text[:50] + '...' if len(self.text) > 50 else self.text
-++      return f'{self.author.username}: {short_text}'
\ No newline at end of file
+        return f'{self.task}{tuple(self.args)} — {self.get_status_display()}'
@@ -0,0 +1,190 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+CURSOR_SEPARATOR = '|'
+
+
+def encode_cursor(moment, pk):
+    """Кодирует позицию в ленте: пару (дата, id)."""
+    raw = f'{moment.isoformat()}{CURSOR_SEPARATOR}{pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Возвращает (дата, id) или None, если курсор повреждён."""
+    if not cursor:
+        return None
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        moment, pk = raw.rsplit(CURSOR_SEPARATOR, 1)
+        return datetime.fromisoformat(moment), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+class CursorPage:
+    """Страница ленты для шаблона includes/paginator.html."""
+
+    is_cursor = True
+
+    def __init__(self, object_list, has_next, has_previous):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if self._has_next:
+            post = self.object_list[-1]
+            return encode_cursor(post.pub_date, post.pk)
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self._has_previous:
+            post = self.object_list[0]
+            return encode_cursor(post.pub_date, post.pk)
+        return None
+
+
+class CursorPaginator:
+    """
+    Пагинация по ключу (pub_date, id) без COUNT и OFFSET.
+    Сортировку ('-pub_date', '-id') пагинатор задаёт сам.
+    """
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = per_page
+
+    def get_page(self, after=None, before=None):
+        after = decode_cursor(after)
+        before = decode_cursor(before)
+        if before and not after:
+            return self._page_before(*before)
+        queryset = self.queryset.order_by('-pub_date', '-pk')
+        if after:
+            pub_date, pk = after
+            queryset = queryset.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+            )
+        posts = list(queryset[:self.per_page + 1])
+        return CursorPage(
+            posts[:self.per_page],
+            has_next=len(posts) > self.per_page,
+            has_previous=after is not None,
+        )
+
+    def _page_before(self, pub_date, pk):
+        queryset = self.queryset.order_by('pub_date', 'pk').filter(
+            Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk)
+        )
+        posts = list(queryset[:self.per_page + 1])
+        has_previous = len(posts) > self.per_page
+        posts = posts[:self.per_page]
+        posts.reverse()
+        return CursorPage(posts, has_next=True, has_previous=has_previous)
+
+
+def get_comment_chunk(comments, per_page, before=None):
+    """
+    Возвращает (комментарии, курсор более ранних комментариев).
+    Берутся per_page самых новых комментариев, созданных раньше курсора
+    before, и отдаются в хронологическом порядке.
+    """
+    before = decode_cursor(before)
+    comments = comments.order_by('-created_at', '-pk')
+    if before:
+        created_at, pk = before
+        comments = comments.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+        )
+    chunk = list(comments[:per_page + 1])
+    previous_cursor = None
+    if len(chunk) > per_page:
+        chunk = chunk[:per_page]
+        previous_cursor = encode_cursor(chunk[-1].created_at, chunk[-1].pk)
+    chunk.reverse()
+    return chunk, previous_cursor
+
+
+def estimate_rows(model, using='default'):
+    """
+    Примерное число строк таблицы по статистике СУБД или None.
+    PostgreSQL: pg_class.reltuples; SQLite: sqlite_stat1 после ANALYZE,
+    иначе наибольший rowid.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class '
+                'WHERE oid = to_regclass(%s)',
+                [table]
+            )
+        elif connection.vendor == 'sqlite':
+            cursor.execute(
+                'SELECT name FROM sqlite_master WHERE name = %s',
+                ['sqlite_stat1']
+            )
+            if cursor.fetchone():
+                cursor.execute(
+                    # Первое число stat — строки таблицы, у любого индекса.
+                    'SELECT CAST(stat AS INTEGER) FROM sqlite_stat1 '
+                    'WHERE tbl = %s LIMIT 1',
+                    [table]
+                )
+                row = cursor.fetchone()
+                if row:
+                    return row[0]
+            cursor.execute(f'SELECT MAX(rowid) FROM "{table}"')
+        else:
+            return None
+        row = cursor.fetchone()
+    # reltuples = -1 у таблиц, по которым ещё не собрана статистика.
+    return row[0] if row and row[0] is not None and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Пагинатор для больших таблиц без точного COUNT(*).
+    Без фильтров число строк берётся из статистики СУБД; с фильтрами
+    считается не больше exact_limit строк, дальше страниц не будет.
+    """
+
+    exact_limit = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_rows(queryset.model, queryset.db)
+            if estimate is not None and estimate > self.exact_limit:
+                return estimate
+        return queryset.order_by()[:self.exact_limit].count()
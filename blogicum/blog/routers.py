@@ -0,0 +1,76 @@
+"""
+Чтение с реплик базы данных.
+
+Реплики — псевдонимы из DATABASES, перечисленные в BLOG_READ_REPLICAS.
+С реплик читают только вьюхи, помеченные read_from_replica (ленты,
+пост, поиск), и только в безопасных запросах. Всё остальное — запись,
+формы редактирования, админка, команды и фоновые задачи — работает с
+основной базой. После любого изменяющего запроса ReplicaMiddleware
+ставит cookie, и BLOG_REPLICA_PIN_SECONDS секунд этот браузер читает
+с основной базы, чтобы видеть свои изменения несмотря на отставание
+реплик.
+
+Отставшая реплика не должна попадать в общий кэш: чужой браузер
+закрепления не получает и увидел бы старые данные до истечения кэша.
+Поэтому страницы и значения, которые кладутся в кэш, читаются с
+основной базы (primary_reads), а фрагменты {% cache %} при чтении с
+реплики только читаются из кэша (см. blog_tags.fragment_cache_timeout).
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY = 'default'
+PIN_COOKIE = 'blog_primary'
+# Псевдоним реплики для чтения в текущем запросе; None — основная база.
+_read_alias = ContextVar('blog_read_alias', default=None)
+
+
+def read_replicas():
+    return list(getattr(settings, 'BLOG_READ_REPLICAS', []))
+
+
+def read_from_replica(view):
+    """Помечает вьюху: её запросы на чтение можно отдать реплике."""
+    view.replica_reads = True
+    return view
+
+
+def use_replica(alias):
+    """Задаёт базу для чтения в текущем контексте; None — основная."""
+    _read_alias.set(alias)
+
+
+def reading_from_replica():
+    return _read_alias.get() is not None
+
+
+@contextmanager
+def primary_reads():
+    """Чтение с основной базы внутри блока: для данных, идущих в кэш."""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *read_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Схема реплик приходит с основной базы репликацией.
+        if db in read_replicas():
+            return False
+        return None
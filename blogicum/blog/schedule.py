@@ -0,0 +1,74 @@
+"""
+Отложенные публикации.
+
+Ленты фильтруют посты по pub_date <= now, поэтому любая закэшированная
+лента устаревает в момент выхода ближайшего отложенного поста.
+Модуль хранит эту дату и отдаёт кэшам и ETag «срок годности» ответа.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Min
+from django.utils import timezone
+
+from . import routers
+
+NEXT_PUB_DATE_KEY = 'blog:schedule:next_pub_date'
+# Страховка от изменений в обход сигналов (bulk_create, update).
+RECHECK_INTERVAL = 300
+NOTHING_SCHEDULED = 'nothing'
+
+
+def _query_next_pub_date(now):
+    from .models import Post
+
+    # Результат кэшируется, поэтому читается с основной базы.
+    with routers.primary_reads():
+        return Post.objects.filter(
+            is_published=True,
+            pub_date__gt=now
+        ).aggregate(next_pub_date=Min('pub_date'))['next_pub_date']
+
+
+def next_pub_date():
+    """Ближайшая дата отложенной публикации или None."""
+    now = timezone.now()
+    cached = cache.get(NEXT_PUB_DATE_KEY)
+    if cached == NOTHING_SCHEDULED:
+        return None
+    if cached is not None and cached > now:
+        return cached
+    value = _query_next_pub_date(now)
+    timeout = RECHECK_INTERVAL
+    if value is not None:
+        timeout = min(timeout, (value - now).total_seconds())
+    cache.set(
+        NEXT_PUB_DATE_KEY,
+        NOTHING_SCHEDULED if value is None else value,
+        max(int(timeout), 1)
+    )
+    return value
+
+
+def reset():
+    """Сбрасывает сохранённую дату; вызывается при изменении постов."""
+    cache.delete(NEXT_PUB_DATE_KEY)
+
+
+def valid_until(timeout):
+    """
+    Момент, до которого ответ можно считать свежим: не позже
+    now + timeout и не позже выхода ближайшего отложенного поста.
+    """
+    now = timezone.now()
+    horizon = now + timedelta(seconds=timeout)
+    scheduled = next_pub_date()
+    if scheduled is not None and scheduled < horizon:
+        return scheduled
+    return horizon
+
+
+def seconds_valid(timeout):
+    """То же, что valid_until(), в секундах от текущего момента."""
+    seconds = (valid_until(timeout) - timezone.now()).total_seconds()
+    return max(int(seconds), 0)
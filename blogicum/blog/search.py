@@ -0,0 +1,178 @@
+"""
+Полнотекстовый поиск по постам.
+
+Индекс — отдельная таблица: виртуальная таблица FTS5 на SQLite и
+таблица с tsvector под GIN-индексом на PostgreSQL. В индекс попадают
+все посты, видимость проверяется при поиске теми же условиями, что и в
+ленте, поэтому снятие с публикации не требует переиндексации. Индекс
+обновляют сигналы сохранения и удаления поста; после вставок в обход
+сигналов (seed_blog, load_dump) вызывается rebuild().
+"""
+import re
+
+from django.db import connections
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+
+SQLITE_TABLE = 'blog_post_fts'
+POSTGRES_TABLE = 'blog_post_search'
+POSTGRES_CONFIG = 'russian'
+TABLES = {
+    'sqlite': SQLITE_TABLE,
+    'postgresql': POSTGRES_TABLE,
+}
+# Заголовок весит больше текста.
+TITLE_WEIGHT = 10.0
+TEXT_WEIGHT = 1.0
+WORD_RE = re.compile(r'\w+')
+
+SQLITE_SCHEMA = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_TABLE} "
+    f"USING fts5(title, text, tokenize='unicode61 remove_diacritics 2')",
+)
+POSTGRES_DOCUMENT = (
+    f"setweight(to_tsvector('{POSTGRES_CONFIG}', {{title}}), 'A') || "
+    f"setweight(to_tsvector('{POSTGRES_CONFIG}', {{text}}), 'B')"
+)
+POSTGRES_SCHEMA = (
+    f'CREATE TABLE IF NOT EXISTS {POSTGRES_TABLE} ('
+    f'post_id bigint PRIMARY KEY REFERENCES blog_post (id) '
+    f'ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, '
+    f'document tsvector NOT NULL)',
+    f'CREATE INDEX IF NOT EXISTS {POSTGRES_TABLE}_document_gin '
+    f'ON {POSTGRES_TABLE} USING GIN (document)',
+)
+
+
+def _vendor(using):
+    return connections[using].vendor
+
+
+def create_index(schema_editor):
+    """Создаёт таблицу индекса; вызывается из миграции."""
+    vendor = schema_editor.connection.vendor
+    statements = {
+        'sqlite': SQLITE_SCHEMA,
+        'postgresql': POSTGRES_SCHEMA,
+    }.get(vendor, ())
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def drop_index(schema_editor):
+    table = TABLES.get(schema_editor.connection.vendor)
+    if table:
+        schema_editor.execute(f'DROP TABLE IF EXISTS {table}')
+
+
+def index_post(post, using='default'):
+    """Добавляет пост в индекс или обновляет его запись."""
+    vendor = _vendor(using)
+    with connections[using].cursor() as cursor:
+        if vendor == 'sqlite':
+            cursor.execute(
+                f'DELETE FROM {SQLITE_TABLE} WHERE rowid = %s', [post.pk]
+            )
+            cursor.execute(
+                f'INSERT INTO {SQLITE_TABLE} (rowid, title, text) '
+                f'VALUES (%s, %s, %s)',
+                [post.pk, post.title, post.text]
+            )
+        elif vendor == 'postgresql':
+            document = POSTGRES_DOCUMENT.format(title='%s', text='%s')
+            cursor.execute(
+                f'INSERT INTO {POSTGRES_TABLE} (post_id, document) '
+                f'VALUES (%s, {document}) ON CONFLICT (post_id) '
+                f'DO UPDATE SET document = EXCLUDED.document',
+                [post.pk, post.title, post.text]
+            )
+
+
+def unindex_post(post_id, using='default'):
+    table = TABLES.get(_vendor(using))
+    if table:
+        column = 'rowid' if table == SQLITE_TABLE else 'post_id'
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {table} WHERE {column} = %s', [post_id]
+            )
+
+
+def rebuild(min_pk=0, using='default'):
+    """
+    Переиндексирует посты с id больше min_pk одним INSERT ... SELECT;
+    min_pk=0 — весь индекс.
+    """
+    vendor = _vendor(using)
+    with connections[using].cursor() as cursor:
+        if vendor == 'sqlite':
+            cursor.execute(
+                f'DELETE FROM {SQLITE_TABLE} WHERE rowid > %s', [min_pk]
+            )
+            cursor.execute(
+                f'INSERT INTO {SQLITE_TABLE} (rowid, title, text) '
+                f'SELECT id, title, text FROM blog_post WHERE id > %s',
+                [min_pk]
+            )
+        elif vendor == 'postgresql':
+            document = POSTGRES_DOCUMENT.format(title='title', text='text')
+            cursor.execute(
+                f'INSERT INTO {POSTGRES_TABLE} (post_id, document) '
+                f'SELECT id, {document} FROM blog_post WHERE id > %s '
+                f'ON CONFLICT (post_id) '
+                f'DO UPDATE SET document = EXCLUDED.document',
+                [min_pk]
+            )
+
+
+def _fts5_query(query):
+    """
+    Запрос пользователя -> выражение FTS5: все слова обязательны,
+    каждое ищется по префиксу, спецсимволы синтаксиса FTS5 отбрасываются.
+    """
+    return ' '.join(f'"{word}"*' for word in WORD_RE.findall(query))
+
+
+def search_posts(queryset, query, using='default'):
+    """
+    Сужает queryset до постов, подходящих под запрос, и сортирует их по
+    релевантности. На других СУБД — поиск подстроки без ранжирования.
+    """
+    vendor = _vendor(using)
+    if vendor == 'sqlite':
+        match = _fts5_query(query)
+        if not match:
+            return queryset.none()
+        matches = RawSQL(
+            f'SELECT rowid FROM {SQLITE_TABLE} '
+            f'WHERE {SQLITE_TABLE} MATCH %s',
+            [match]
+        )
+        # bm25() тем меньше, чем лучше совпадение.
+        rank = RawSQL(
+            f'SELECT -bm25({SQLITE_TABLE}, {TITLE_WEIGHT}, {TEXT_WEIGHT}) '
+            f'FROM {SQLITE_TABLE} '
+            f'WHERE {SQLITE_TABLE} MATCH %s AND rowid = blog_post.id',
+            [match],
+            output_field=FloatField()
+        )
+    elif vendor == 'postgresql':
+        tsquery = f"websearch_to_tsquery('{POSTGRES_CONFIG}', %s)"
+        matches = RawSQL(
+            f'SELECT post_id FROM {POSTGRES_TABLE} '
+            f'WHERE document @@ {tsquery}',
+            [query]
+        )
+        rank = RawSQL(
+            f'SELECT ts_rank_cd(document, {tsquery}) '
+            f'FROM {POSTGRES_TABLE} WHERE post_id = blog_post.id',
+            [query],
+            output_field=FloatField()
+        )
+    else:
+        return queryset.filter(title__icontains=query) | queryset.filter(
+            text__icontains=query
+        )
+    return queryset.filter(pk__in=matches).annotate(rank=rank).order_by(
+        '-rank', '-pub_date'
+    )
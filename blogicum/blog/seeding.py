@@ -0,0 +1,217 @@
+"""
+Генерация синтетических данных блога пачками через bulk_create.
+
+Распределения задаются строками вида 'fixed:10', 'uniform:0:20',
+'exp:10' (экспоненциальное со средним 10) или 'pareto:1.5:2'
+(распределение Парето с параметром формы 1.5 и минимумом 2).
+"""
+import random
+import time
+from datetime import timedelta
+from io import BytesIO
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image
+
+from . import cache, images, schedule, search
+from .models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+PASSWORD = 'seed-password'
+SEED_IMAGES = 5
+WORDS = (
+    'блог запись город море горы лес река поезд дорога утро вечер '
+    'кофе книга музыка фото друзья работа отпуск погода новости'
+).split()
+
+
+def parse_distribution(spec):
+    """Превращает строку распределения в функцию rng -> целое >= 0."""
+    kind, *params = spec.split(':')
+    try:
+        params = [float(param) for param in params]
+        if kind == 'fixed':
+            value, = params
+            return lambda rng: int(value)
+        if kind == 'uniform':
+            low, high = params
+            return lambda rng: rng.randint(int(low), int(high))
+        if kind == 'exp':
+            mean, = params
+            return lambda rng: int(rng.expovariate(1 / mean)) if mean else 0
+        if kind == 'pareto':
+            alpha, minimum = params
+            return lambda rng: int(minimum * rng.paretovariate(alpha))
+    except ValueError:
+        pass
+    raise ValueError(f'Неверное распределение: {spec}')
+
+
+def _text(rng, n_words):
+    return ' '.join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def _batches(objects, batch_size):
+    objects = iter(objects)
+    while True:
+        batch = list(islice(objects, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _bulk_insert(model, objects, batch_size):
+    """Вставляет объекты пачками; возвращает число строк."""
+    total = 0
+    for batch in _batches(objects, batch_size):
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+        total += len(batch)
+    return total
+
+
+def _last_pk(model):
+    return model.objects.order_by('-pk').values_list(
+        'pk', flat=True
+    ).first() or 0
+
+
+def _seed_images(prefix):
+    """
+    Несколько картинок в post_images/, общих для всех постов,
+    с уменьшенными копиями: пары (имя, ширины копий).
+    """
+    seeded = []
+    for i in range(SEED_IMAGES):
+        name = f'post_images/{prefix}_{i}.jpg'
+        if not default_storage.exists(name):
+            buffer = BytesIO()
+            Image.new('RGB', (800, 600), (40 * i, 90, 160)).save(
+                buffer, format='JPEG'
+            )
+            name = default_storage.save(name, ContentFile(buffer.getvalue()))
+        seeded.append((name, images.make_thumbnails(name)))
+    return seeded
+
+
+def seed_blog(
+    users=100,
+    categories=10,
+    locations=20,
+    posts_per_author='uniform:0:20',
+    comments_per_post='exp:5',
+    unpublished=0.05,
+    future=0.02,
+    with_image=0.0,
+    batch_size=5000,
+    seed=42,
+    prefix='seed',
+):
+    """
+    Создаёт пользователей, категории, местоположения, посты и комментарии.
+    Возвращает {модель: (строк, секунд)}.
+    """
+    rng = random.Random(seed)
+    posts_per_author = parse_distribution(posts_per_author)
+    comments_per_post = parse_distribution(comments_per_post)
+    now = timezone.now()
+    stats = {}
+
+    def timed(name, model, objects):
+        start = time.perf_counter()
+        rows = _bulk_insert(model, objects, batch_size)
+        stats[name] = (rows, time.perf_counter() - start)
+
+    # На SQLite bulk_create не возвращает id, поэтому новые строки
+    # выбираются по id больше последнего существующего.
+    last_user_id = _last_pk(User)
+    offset = User.objects.count()
+    password = make_password(PASSWORD)
+    timed('users', User, (
+        User(username=f'{prefix}_user_{offset + i}', password=password)
+        for i in range(users)
+    ))
+    author_ids = list(User.objects.filter(
+        pk__gt=last_user_id
+    ).values_list('pk', flat=True))
+
+    offset = Category.objects.count()
+    timed('categories', Category, (
+        Category(
+            title=f'Категория {offset + i}',
+            description=_text(rng, 12),
+            slug=f'{prefix}-category-{offset + i}',
+        )
+        for i in range(categories)
+    ))
+    timed('locations', Location, (
+        Location(name=f'Место {i}') for i in range(locations)
+    ))
+    category_ids = list(Category.objects.values_list('pk', flat=True))
+    location_ids = list(Location.objects.values_list('pk', flat=True))
+    seed_images = _seed_images(prefix) if with_image else []
+
+    def generate_posts():
+        for author_id in author_ids:
+            for _ in range(posts_per_author(rng)):
+                if rng.random() < future:
+                    pub_date = now + timedelta(
+                        minutes=rng.randint(1, 43200)
+                    )
+                else:
+                    pub_date = now - timedelta(
+                        minutes=rng.randint(1, 525600)
+                    )
+                image, thumbnails = '', []
+                if seed_images and rng.random() < with_image:
+                    image, thumbnails = rng.choice(seed_images)
+                yield Post(
+                    title=_text(rng, rng.randint(2, 6)).capitalize(),
+                    text=_text(rng, rng.randint(20, 200)),
+                    pub_date=pub_date,
+                    author_id=author_id,
+                    category_id=rng.choice(category_ids),
+                    location_id=rng.choice(location_ids + [None]),
+                    is_published=rng.random() >= unpublished,
+                    image=image,
+                    thumbnails=thumbnails,
+                )
+
+    last_post_id = _last_pk(Post)
+    timed('posts', Post, generate_posts())
+    post_ids = Post.objects.filter(pk__gt=last_post_id).order_by(
+        'pk'
+    ).values_list('pk', flat=True).iterator(chunk_size=batch_size)
+
+    def generate_comments():
+        for post_id in post_ids:
+            for _ in range(comments_per_post(rng)):
+                yield Comment(
+                    text=_text(rng, rng.randint(3, 40)),
+                    post_id=post_id,
+                    author_id=rng.choice(author_ids),
+                )
+
+    timed('comments', Comment, generate_comments())
+
+    # bulk_create не вызывает сигналы: счётчики и кэши обновляем сами.
+    start = time.perf_counter()
+    Post.objects.filter(pk__gt=last_post_id).recount_comments()
+    stats['comment_count'] = (
+        stats['posts'][0], time.perf_counter() - start
+    )
+    start = time.perf_counter()
+    search.rebuild(min_pk=last_post_id)
+    stats['search_index'] = (
+        stats['posts'][0], time.perf_counter() - start
+    )
+    schedule.reset()
+    cache.purge_feeds(cache.ALL_FEEDS)
+    return stats
@@ -0,0 +1,207 @@
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import cache, connections, images, jobs, schedule, search
+from .models import Category, Comment, Location, Post, User
+
+
+def get_post_feeds(post_ids):
+    """Пары (slug категории, имя автора) для лент, где видны посты."""
+    return list(Post.objects.filter(pk__in=post_ids).values_list(
+        'category__slug', 'author__username'
+    ))
+
+
+def purge_post_feeds(feeds):
+    for category_slug, username in set(feeds):
+        cache.purge_post_feeds(category_slug, username)
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_post(sender, instance, **kwargs):
+    """Запоминает пост, к которому комментарий был привязан до сохранения."""
+    if instance.pk is None:
+        instance._previous_post_id = None
+        return
+    instance._previous_post_id = Comment.objects.filter(
+        pk=instance.pk
+    ).values_list('post_id', flat=True).first()
+
+
+@receiver(post_save, sender=Comment)
+def update_comment_count_on_save(sender, instance, **kwargs):
+    """Обновляет счётчик после добавления, правки или снятия с публикации."""
+    post_ids = {instance.post_id}
+    previous_post_id = getattr(instance, '_previous_post_id', None)
+    if previous_post_id is not None:
+        post_ids.add(previous_post_id)
+    Post.objects.filter(pk__in=post_ids).recount_comments(
+        updated_at=timezone.now()
+    )
+    purge_post_feeds(get_post_feeds(post_ids))
+
+
+@receiver(post_delete, sender=Comment)
+def update_comment_count_on_delete(sender, instance, **kwargs):
+    """Обновляет счётчик после удаления комментария."""
+    Post.objects.filter(pk=instance.post_id).recount_comments(
+        updated_at=timezone.now()
+    )
+    purge_post_feeds(get_post_feeds([instance.post_id]))
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_delete, sender=Post)
+def remember_post_feeds(sender, instance, **kwargs):
+    """Запоминает ленты, в которых пост был виден до изменения."""
+    instance._previous_feeds = (
+        get_post_feeds([instance.pk]) if instance.pk is not None else []
+    )
+
+
+@receiver(pre_save, sender=Post)
+def fill_missing_updated_at(sender, instance, raw=False, **kwargs):
+    """
+    Команда loaddata сохраняет с raw=True, и auto_now не срабатывает: в дампах,
+    снятых до появления Post.updated_at, поле было бы пустым.
+    """
+    if raw and instance.updated_at is None:
+        instance.updated_at = timezone.now()
+
+
+@receiver(pre_save, sender=Post)
+def forget_stale_thumbnails(sender, instance, raw=False, **kwargs):
+    """
+    Копии старой картинки не подходят к новой или удалённой: запоминает
+    их для удаления после сохранения.
+    """
+    if raw:
+        return
+    image = instance.image
+    instance._image_uploaded = bool(image) and not image._committed
+    if not image or instance._image_uploaded:
+        if instance.thumbnails and instance.pk is not None:
+            old_image = Post.objects.filter(pk=instance.pk).values_list(
+                'image', flat=True
+            ).first()
+            if old_image:
+                instance._stale_thumbnails = (old_image, instance.thumbnails)
+        instance.thumbnails = []
+
+
+def delete_thumbnails_on_commit(name, widths):
+    storage = Post._meta.get_field('image').storage
+    transaction.on_commit(
+        lambda: images.delete_unused_thumbnails(name, widths, storage)
+    )
+
+
+@receiver(post_save, sender=Post)
+def delete_stale_thumbnails(sender, instance, raw=False, **kwargs):
+    """Удаляет копии заменённой или убранной картинки."""
+    stale = getattr(instance, '_stale_thumbnails', None)
+    if raw or stale is None:
+        return
+    instance._stale_thumbnails = None
+    delete_thumbnails_on_commit(*stale)
+
+
+@receiver(post_delete, sender=Post)
+def delete_post_thumbnails(sender, instance, **kwargs):
+    """Удаляет копии картинки удалённого поста."""
+    if instance.image and instance.thumbnails:
+        delete_thumbnails_on_commit(instance.image.name, instance.thumbnails)
+
+
+@receiver(post_save, sender=Post)
+def queue_thumbnails(sender, instance, raw=False, **kwargs):
+    """Ставит в очередь создание копий только что загруженной картинки."""
+    if raw or not getattr(instance, '_image_uploaded', False):
+        return
+    instance._image_uploaded = False
+    jobs.enqueue(images.POST_IMAGE_TASK, instance.pk)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_card(sender, instance, **kwargs):
+    """Сбрасывает кэш карточки и лент при изменении или удалении поста."""
+    cache.bump_version('post', instance.pk)
+    schedule.reset()
+    feeds = getattr(instance, '_previous_feeds', [])
+    if kwargs['signal'] is post_save:
+        feeds = feeds + get_post_feeds([instance.pk])
+    purge_post_feeds(feeds)
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, update_fields=None, **kwargs):
+    """Обновляет запись поста в поисковом индексе."""
+    if update_fields is not None and not {'title', 'text'} & set(
+        update_fields
+    ):
+        return
+    search.index_post(instance, using=kwargs.get('using', 'default'))
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    search.unindex_post(instance.pk, using=kwargs.get('using', 'default'))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_cards(sender, instance, **kwargs):
+    """Сбрасывает кэш карточек всех постов категории и кэш лент."""
+    cache.bump_version('category', instance.pk)
+    cache.purge_feeds(cache.ALL_FEEDS)
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location_cards(sender, instance, **kwargs):
+    """Сбрасывает кэш карточек с этим местоположением и кэш лент."""
+    cache.bump_version('location', instance.pk)
+    cache.purge_feeds(cache.ALL_FEEDS)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_author_cards(sender, instance, update_fields=None, **kwargs):
+    """
+    Сбрасывает кэш карточек автора, если могло смениться имя, и
+    обновляет updated_at постов с его комментариями: имя комментатора
+    видно на странице поста, и её ETag должен смениться.
+    """
+    if kwargs.get('created'):
+        return
+    if update_fields is not None and 'username' not in update_fields:
+        return
+    cache.bump_version('user', instance.pk)
+    cache.purge_feeds(cache.ALL_FEEDS)
+    Post.objects.filter(pk__in=Comment.objects.filter(
+        author=instance
+    ).values('post_id')).update(updated_at=timezone.now())
+
+
+@receiver(connection_created)
+def tune_sqlite_connection(sender, connection, **kwargs):
+    connections.apply_sqlite_pragmas(connection)
+
+
+@receiver(request_started)
+def check_persistent_connections(sender, **kwargs):
+    """
+    Проверка постоянных соединений перед запросом; идёт после
+    close_old_connections, который закрывает соединения старше
+    CONN_MAX_AGE.
+    """
+    if getattr(settings, 'BLOG_CONN_HEALTH_CHECKS', False):
+        connections.close_broken_connections()
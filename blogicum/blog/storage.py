@@ -0,0 +1,71 @@
+"""
+Хранилище статики для продакшена.
+
+CompressedManifestStaticFilesStorage — ManifestStaticFilesStorage
+(имена с хешем содержимого, например css/bootstrap.min.3f2a9c.css), которое
+после collectstatic кладёт рядом с текстовыми файлами сжатые копии:
+.gz всегда и .br, если установлен пакет brotli. Копии отдаёт
+StaticAssetsMiddleware или веб-сервер (gzip_static в nginx), так что на
+каждом запросе сжимать не нужно.
+"""
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.map', '.svg', '.txt', '.html', '.json', '.xml', '.ico',
+)
+# Мелкие файлы сжатие почти не уменьшает.
+MIN_SIZE = 256
+# Копия нужна, только если она заметно меньше оригинала.
+MAX_RATIO = 0.95
+
+
+def compress_gzip(content):
+    # mtime=0: одинаковые файлы дают одинаковые архивы между сборками.
+    return gzip.compress(content, compresslevel=9, mtime=0)
+
+
+def compress_brotli(content):
+    return brotli.compress(content, quality=11)
+
+
+def encoders():
+    """Пары (суффикс, функция сжатия) в порядке предпочтения клиентом."""
+    result = [('.br', compress_brotli)] if brotli else []
+    result.append(('.gz', compress_gzip))
+    return result
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for name in self.hashed_files.values():
+            self.compress(name)
+
+    def compress(self, name):
+        """Создаёт сжатые копии файла name; возвращает их имена."""
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+            return []
+        with self.open(name) as original:
+            content = original.read()
+        if len(content) < MIN_SIZE:
+            return []
+        created = []
+        for suffix, compress in encoders():
+            compressed = compress(content)
+            if len(compressed) > len(content) * MAX_RATIO:
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
+            created.append(name + suffix)
+        return created
@@ -0,0 +1,34 @@
+"""
+Движок шаблонов с учётом времени рендера.
+
+TimedDjangoTemplates — обычный DjangoTemplates, шаблоны которого
+добавляют время рендера в статистику QueryBudgetMiddleware. Без
+BLOG_QUERY_BUDGET статистики нет, и рендер идёт как обычно.
+"""
+import time
+
+from django.template.backends.django import DjangoTemplates, Template
+
+from .middleware import current_stats
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        stats = current_stats()
+        if stats is None:
+            return super().render(context, request)
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            stats.template_time += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    def from_string(self, template_code):
+        template = super().from_string(template_code)
+        return TimedTemplate(template.template, self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
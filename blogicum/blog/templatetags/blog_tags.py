@@ -0,0 +1,76 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django_bootstrap5.templatetags.django_bootstrap5 import bootstrap_css
+
+from blog import cache, images, routers
+from blog.fast_urls import blog_url as build_blog_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_card_version(post):
+    """Версия для ключа {% cache %} карточки поста."""
+    return cache.post_card_version(post)
+
+
+@register.simple_tag
+def fragment_cache_timeout(timeout):
+    """
+    Время жизни для {% cache %}: 0, то есть не сохранять, если страница
+    читает с реплики (отставшие данные попали бы в кэш для всех).
+    Готовые фрагменты из кэша при этом используются.
+    """
+    return 0 if routers.reading_from_replica() else timeout
+
+
+@register.simple_tag
+def blog_url(name, *args, **kwargs):
+    """
+    {% url %} для маршрутов блога без reverse() на каждый вызов:
+    {% blog_url 'post_detail' post.id %}. См. blog.fast_urls.
+    """
+    return build_blog_url(name, *args, **kwargs)
+
+
+@register.simple_tag
+def bootstrap_stylesheet():
+    """
+    Стили Bootstrap: при BLOG_LOCAL_ASSETS — из static_dev/css через
+    хранилище статики (имя с хешем, сжатые копии), иначе — с CDN.
+    """
+    if getattr(settings, 'BLOG_LOCAL_ASSETS', False):
+        return format_html(
+            '<link rel="stylesheet" href="{}">',
+            static('css/bootstrap.min.css'),
+        )
+    return bootstrap_css()
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post):
+    """
+    Картинка поста с уменьшенными копиями в srcset.
+    Пока копий нет, показывается оригинал.
+    """
+    image = post.image
+    context = {'original': image.url, 'src': image.url}
+    widths = post.thumbnails
+    if widths:
+        # Для браузеров без srcset — копия под карточку 40rem.
+        default = max(
+            [width for width in widths if width <= 640] or widths[:1]
+        )
+        context.update(
+            src=image.storage.url(
+                images.thumbnail_name(image.name, default, 'jpg')
+            ),
+            srcset=images.srcset(image.name, widths, 'jpg', image.storage),
+            webp_srcset=images.srcset(
+                image.name, widths, 'webp', image.storage
+            ),
+            sizes=images.SIZES,
+        )
+    return context
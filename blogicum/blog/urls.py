@@ -1,20 +1,30 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
+
+# Вьюхи только для чтения; под ASGI — асинхронные (см. async_views).
+read_views = async_views if getattr(
+    settings, 'BLOG_ASYNC_VIEWS', False
+) else views
 
 app_name = 'blog'
 
 urlpatterns = [
-    path('', views.index, name='index'),
-    path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
+    path('', read_views.index, name='index'),
+    path('posts/<int:post_id>/', read_views.post_detail, name='post_detail'),
     path('posts/create/', views.create_post, name='create_post'),
     path('posts/<int:post_id>/edit/', views.edit_post, name='edit_post'),
     path('posts/<int:post_id>/delete/', views.delete_post, name='delete_post'),
     path('posts/<int:post_id>/comment/', views.add_comment, name='add_comment'),
+    path('posts/<int:post_id>/comments/',
+         views.post_comments, name='post_comments'),
     path('posts/<int:post_id>/edit_comment/<int:comment_id>/', 
          views.edit_comment, name='edit_comment'),
     path('posts/<int:post_id>/delete_comment/<int:comment_id>/', 
          views.delete_comment, name='delete_comment'),
-    path('category/<slug:category_slug>/', views.category_posts, name='category_posts'),
-    path('profile/<str:username>/', views.profile, name='profile'),
+    path('category/<slug:category_slug>/',
+         read_views.category_posts, name='category_posts'),
+    path('search/', views.search, name='search'),
+    path('profile/<str:username>/', read_views.profile, name='profile'),
     path('profile/<str:username>/edit/', views.edit_profile, name='edit_profile'),
 ]
\ No newline at end of file
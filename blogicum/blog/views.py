@@ -1,71 +1,128 @@
+from urllib.parse import urlencode
+
 from django.shortcuts import render, get_object_or_404, redirect
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
+from django.db import DatabaseError, IntegrityError
 from django.http import Http404
+from django.views.decorators.http import condition
 from django.core.paginator import Paginator
+from django.conf import settings
 from django.contrib import messages  
 from .models import Post, Category, Comment
-from django.db.models import Count
 from .forms import PostForm, CommentForm, ProfileForm  
+from .pagination import CursorPaginator, get_comment_chunk
+from . import cache, comment_buffer
+from .routers import read_from_replica
+from .search import search_posts
+from .conditional import (
+    feed_etag, post_detail_etag, post_detail_last_modified
+)
 
 User = get_user_model()
 
+# Через сколько секунд повторить запрос, если комментарий не записан.
+COMMENT_RETRY_AFTER = 5
+
+
+# ========== ВСПОМОГАТЕЛЬНЫЕ ФУНКЦИИ (Пункт 5) ==========
+
+def get_published_posts():
+    """Возвращает QuerySet опубликованных постов."""
+    return Post.objects.filter(
+        is_published=True,
+        category__is_published=True,
+        pub_date__lte=timezone.now()
+    ).select_related('author', 'category').order_by('-pub_date')
+
+
+def get_user_posts(user, viewer=None):
+    """
+    Возвращает посты пользователя с учетом прав просматривающего.
+    viewer - кто смотрит (request.user)
+    """
+    if viewer == user:
+        # Автор видит все свои посты
+        return Post.objects.filter(
+            author=user
+        ).select_related('author', 'category').order_by('-pub_date')
+    else:
+        # Остальные видят только опубликованные
+        return get_published_posts().filter(author=user)
+
+
+def paginate_queryset(request, queryset, items_per_page=10, cursor=None):
+    """
+    Пагинация queryset.
+    cursor=True включает пагинацию по курсору (pub_date, id) вместо
+    номеров страниц; по умолчанию берётся BLOG_CURSOR_PAGINATION.
+    """
+    if cursor is None:
+        cursor = getattr(settings, 'BLOG_CURSOR_PAGINATION', False)
+    if cursor:
+        paginator = CursorPaginator(queryset, items_per_page)
+        return paginator.get_page(
+            after=request.GET.get('after'),
+            before=request.GET.get('before')
+        )
+    paginator = Paginator(queryset, items_per_page)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    return page_obj
+
+
+def get_visible_post(request, post_id, queryset=Post.objects):
+    """
+    Возвращает пост или 404. Автор видит свой пост всегда,
+    остальные — только опубликованный.
+    """
+    post = get_object_or_404(queryset, pk=post_id)
+    
+    # Если пользователь не автор - проверяем все условия публикации
+    if request.user != post.author:
+        # Проверяем: опубликован ли пост, опубликована ли категория, наступила ли дата
+        if not (post.is_published and 
+                post.category.is_published and 
+                post.pub_date <= timezone.now()):
+            raise Http404("Пост не найден или недоступен")
+    return post
+
 
-++ # ========== ВСПОМОГАТЕЛЬНЫЕ ФУНКЦИИ (Пункт 5) ==========
-++ 
-++ def get_published_posts():
-++     """Возвращает QuerySet опубликованных постов."""
-++     return Post.objects.filter(
-++         is_published=True,
-++         category__is_published=True,
-++         pub_date__lte=timezone.now()
-++     ).select_related('author', 'category').annotate(
-++         comment_count=Count('comments')
-++     ).order_by('-pub_date')
-++ 
-++ 
-++ def get_user_posts(user, viewer=None):
-++     """
-++     Возвращает посты пользователя с учетом прав просматривающего.
-++     viewer - кто смотрит (request.user)
-++     """
-++     if viewer == user:
-++         # Автор видит все свои посты
-++         return Post.objects.filter(
-++             author=user
-++         ).select_related('author', 'category').annotate(
-++             comment_count=Count('comments')
-++         ).order_by('-pub_date')
-++     else:
-++         # Остальные видят только опубликованные
-++         return get_published_posts().filter(author=user)
-++ 
-++ 
-++ def paginate_queryset(request, queryset, items_per_page=10):
-++     """Пагинация queryset."""
-++     paginator = Paginator(queryset, items_per_page)
-++     page_number = request.GET.get('page')
-++     page_obj = paginator.get_page(page_number)
-++     return page_obj
-++ 
-++ 
-++ # ========== ОСНОВНЫЕ ВЬЮХИ ==========
+def get_published_comments(post, before=None):
+    """Порция опубликованных комментариев поста и курсор следующей."""
+    comments = post.comments.filter(
+        is_published=True
+    ).select_related('author')
+    return get_comment_chunk(
+        comments,
+        getattr(settings, 'BLOG_COMMENTS_PER_PAGE', 20),
+        before=before
+    )
+
+
+# ========== ОСНОВНЫЕ ВЬЮХИ ==========
 
 
+@read_from_replica
+@condition(etag_func=feed_etag(cache.index_feed))
+@cache.cache_anonymous_page(cache.index_feed)
 def index(request):
     """Главная страница."""
-++  posts = get_published_posts()
-++  page_obj = paginate_queryset(request, posts)
+    posts = get_published_posts()
+    page_obj = paginate_queryset(request, posts)
     return render(request, 'blog/index.html', {'page_obj': page_obj})
 
 
+@read_from_replica
+@condition(etag_func=feed_etag(cache.profile_feed))
+@cache.cache_anonymous_page(cache.profile_feed)
 def profile(request, username):
     profile_user = get_object_or_404(User, username=username)
     
-++  # Получаем посты пользователя с учетом прав
-++  posts = get_user_posts(profile_user, viewer=request.user)
-++  page_obj = paginate_queryset(request, posts)
+    # Получаем посты пользователя с учетом прав
+    posts = get_user_posts(profile_user, viewer=request.user)
+    page_obj = paginate_queryset(request, posts)
     
     return render(request, 'blog/profile.html', {
         'profile': profile_user,
@@ -73,16 +130,19 @@ def profile(request, username):
     })
 
 
+@read_from_replica
+@condition(etag_func=feed_etag(cache.category_feed))
+@cache.cache_anonymous_page(cache.category_feed)
 def category_posts(request, category_slug):
     """Посты категории."""
     category = get_object_or_404(
-++      Category,
+        Category,
         slug=category_slug,
-++      is_published=True  # Проверяем сразу в get_object_or_404
+        is_published=True  # Проверяем сразу в get_object_or_404
     )
-++  # Только опубликованные посты в опубликованной категории
-++  posts = get_published_posts().filter(category=category)
-++  page_obj = paginate_queryset(request, posts)
+    # Только опубликованные посты в опубликованной категории
+    posts = get_published_posts().filter(category=category)
+    page_obj = paginate_queryset(request, posts)
     
     return render(request, 'blog/category.html', {
         'category': category,
@@ -90,27 +150,62 @@ def category_posts(request, category_slug):
     })
 
 
+@read_from_replica
+def search(request):
+    """Полнотекстовый поиск по опубликованным постам."""
+    query = request.GET.get('q', '').strip()
+    posts = Post.objects.none()
+    if query:
+        posts = search_posts(get_published_posts(), query)
+    # Результаты отсортированы по релевантности: курсор по дате не подходит.
+    page_obj = paginate_queryset(request, posts, cursor=False)
+    return render(request, 'blog/search.html', {
+        'query': query,
+        'page_obj': page_obj,
+        'page_query': urlencode({'q': query}) + '&' if query else ''
+    })
+
+
+@read_from_replica
+@condition(
+    etag_func=post_detail_etag,
+    last_modified_func=post_detail_last_modified
+)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
-    
-    # Если пользователь не автор - проверяем все условия публикации
-    if request.user != post.author:
-        # Проверяем: опубликован ли пост, опубликована ли категория, наступила ли дата
-        if not (post.is_published and 
-                post.category.is_published and 
-                post.pub_date <= timezone.now()):
-            raise Http404("Пост не найден или недоступен")
+    post = get_visible_post(
+        request,
+        post_id,
+        Post.objects.select_related('author', 'category', 'location')
+    )
     
-    comments = post.comments.filter(is_published=True)
+    # Первая страница — только самые новые комментарии
+    comments, previous_cursor = get_published_comments(post)
     form = CommentForm() if request.user.is_authenticated else None
     
     return render(request, 'blog/detail.html', {
         'post': post,
         'comments': comments,
+        'previous_cursor': previous_cursor,
         'form': form
     })
 
 
+@read_from_replica
+def post_comments(request, post_id):
+    """Более ранние комментарии поста HTML-фрагментом для подгрузки."""
+    post = get_visible_post(
+        request, post_id, Post.objects.select_related('author', 'category')
+    )
+    comments, previous_cursor = get_published_comments(
+        post, before=request.GET.get('before')
+    )
+    return render(request, 'includes/comment_list.html', {
+        'post': post,
+        'comments': comments,
+        'previous_cursor': previous_cursor
+    })
+
+
 @login_required
 def edit_profile(request, username):
     user = get_object_or_404(User, username=username)
@@ -129,20 +224,59 @@ def edit_profile(request, username):
     return render(request, 'blog/user.html', {'form': form, 'profile': user})
 
 
-@login_required
-def add_comment(request, post_id):
+def comment_unavailable(request, post_id, pending=False):
+    """
+    Ответ 503, когда буфер не записал комментарий. pending — запись
+    не успела, и комментарий ещё может появиться: повторная отправка
+    дала бы дубль.
+    """
+    response = render(request, 'blog/comment_unavailable.html', {
+        'post_id': post_id,
+        'pending': pending,
+    }, status=503)
+    response['Retry-After'] = COMMENT_RETRY_AFTER
+    return response
+
+
+def save_buffered_comment(request, comment, post_id):
+    """
+    Сохраняет комментарий через буфер (BLOG_COMMENT_BUFFER).
+    Возвращает None или ответ, если комментарий не записан.
+    """
+    # Пост проверит внешний ключ при записи пачки.
+    comment.post_id = post_id
     try:
-        post = Post.objects.get(pk=post_id)
-    except Post.DoesNotExist:
+        comment_buffer.save_comment(comment)
+    except IntegrityError:
         raise Http404("Пост не найден")
+    except comment_buffer.CommentPending:
+        return comment_unavailable(request, post_id, pending=True)
+    except DatabaseError:
+        return comment_unavailable(request, post_id)
+    return None
+
+
+@login_required
+def add_comment(request, post_id):
+    buffered = getattr(settings, 'BLOG_COMMENT_BUFFER', False)
+    if not buffered:
+        try:
+            post = Post.objects.get(pk=post_id)
+        except Post.DoesNotExist:
+            raise Http404("Пост не найден")
     
     if request.method == 'POST':
         form = CommentForm(request.POST)
         if form.is_valid():
             comment = form.save(commit=False)
             comment.author = request.user
-            comment.post = post
-            comment.save()
+            if buffered:
+                error = save_buffered_comment(request, comment, post_id)
+                if error is not None:
+                    return error
+            else:
+                comment.post = post
+                comment.save()
             return redirect('blog:post_detail', post_id=post_id)
         else:
             print(f"FORM INVALID - redirecting")
@@ -1,5 +1,5 @@
 """
-ASGI config for anfisa_for_friends project.
+ASGI config for blogicum project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
@@ -11,6 +11,8 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'anfisa_for_friends.settings')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+# Ленты и страницы постов — асинхронными вьюхами (blog.async_views).
+os.environ.setdefault('BLOG_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
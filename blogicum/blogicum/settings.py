@@ -1,5 +1,9 @@
+import os
 from pathlib import Path
 import sys
+
+from django.utils.module_loading import import_string
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 TEMPLATES_DIR = BASE_DIR / 'templates'  
 
@@ -22,6 +26,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'blog.middleware.StaticAssetsMiddleware',
+    'blog.middleware.QueryBudgetMiddleware',
+    'blog.middleware.ReplicaMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -32,9 +39,10 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'blogicum.urls'
 
+# Тот же DjangoTemplates, но со временем рендера для BLOG_QUERY_BUDGET.
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'blog.template_backends.TimedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -72,6 +80,8 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static_dev']
+# Сюда collectstatic собирает статику для продакшена.
+STATIC_ROOT = BASE_DIR / 'static'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -85,6 +95,67 @@ LOGOUT_REDIRECT_URL = 'blog:index'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Пагинация лент по курсору (pub_date, id): без COUNT(*) и OFFSET.
+BLOG_CURSOR_PAGINATION = False
+
+# Кэш лент для анонимных пользователей, секунды; 0 — выключен.
+BLOG_PAGE_CACHE_TIMEOUT = 300
+
+# Сколько комментариев показывать на странице поста и подгружать за раз.
+BLOG_COMMENTS_PER_PAGE = 20
+
+# Учёт SQL-запросов по вьюхам (заголовок Server-Timing и журнал для
+# команды query_budget_report). Выключен по умолчанию.
+BLOG_QUERY_BUDGET = False
+BLOG_QUERY_BUDGET_LOG = BASE_DIR / 'query_budget.jsonl'
+
+# Фоновые задачи (копии картинок) выполняет команда run_worker. С True
+# задачи выполняются в процессе сайта сразу после коммита — удобно для
+# разработки без воркера, но возвращает обработку в запрос.
+BLOG_JOBS_EAGER = False
+
+# Админка для больших таблиц постов и комментариев: примерные счётчики
+# вместо COUNT(*), фильтры по связям с поиском, без навигации по датам.
+BLOG_ADMIN_LARGE_TABLES = False
+
+# Асинхронные вьюхи лент и поста; включается в blogicum/asgi.py.
+BLOG_ASYNC_VIEWS = os.environ.get('BLOG_ASYNC_VIEWS') == '1'
+
+# Реплики для чтения лент и постов: псевдонимы из DATABASES, например
+# 'replica': {..., 'TEST': {'MIRROR': 'default'}}. После изменяющего
+# запроса браузер BLOG_REPLICA_PIN_SECONDS секунд читает с основной базы.
+DATABASE_ROUTERS = ['blog.routers.ReplicaRouter']
+BLOG_READ_REPLICAS = []
+BLOG_REPLICA_PIN_SECONDS = 10
+
+# PRAGMA для каждого нового соединения с SQLite и проверка постоянных
+# соединений перед запросом; включаются в blogicum/settings_production.py.
+BLOG_SQLITE_PRAGMAS = {}
+BLOG_CONN_HEALTH_CHECKS = False
+
+# Буфер записи комментариев: пачки через bulk_create раз в
+# BLOG_COMMENT_BUFFER_DELAY секунд или по BLOG_COMMENT_BUFFER_SIZE штук.
+BLOG_COMMENT_BUFFER = False
+BLOG_COMMENT_BUFFER_DELAY = 0.005
+BLOG_COMMENT_BUFFER_SIZE = 100
+
+# Компилировать шаблоны templates/ при старте (blog.warmup); имеет смысл
+# с кэширующим загрузчиком, как в blogicum/settings_production.py.
+BLOG_WARM_TEMPLATES = False
+
+# Отдавать собранную статику из STATIC_ROOT самим приложением
+# (blog.middleware.StaticAssetsMiddleware) и брать стили Bootstrap из
+# своей статики, а не с CDN.
+BLOG_SERVE_STATIC = False
+BLOG_LOCAL_ASSETS = False
+
+# У модели пользователя нет своего get_absolute_url: адрес профиля.
+ABSOLUTE_URL_OVERRIDES = {
+    'auth.user': lambda user: import_string('blog.fast_urls.profile_url')(
+        user
+    ),
+}
+
 if 'test' in sys.argv:
     CSRF_COOKIE_SECURE = False
     CSRF_USE_SESSIONS = False
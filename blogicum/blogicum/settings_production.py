@@ -0,0 +1,65 @@
+"""
+Профиль для продакшена:
+
+    DJANGO_SETTINGS_MODULE=blogicum.settings_production
+    DJANGO_SECRET_KEY=...
+
+Постоянные соединения с базой с проверкой перед запросом и настройка
+SQLite для одновременных чтения и записи (см. blog.connections).
+Шаблоны компилируются один раз: кэширующий загрузчик и прогрев при
+старте (см. blog.warmup). Статика собирается collectstatic с хешем
+содержимого в именах и сжатыми копиями (см. blog.storage) и отдаётся
+приложением с долгим кэшированием.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES, TEMPLATES
+
+DEBUG = False
+# Ключ из settings.py лежит в репозитории и для продакшена не годится.
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    raise ImproperlyConfigured('Задайте переменную DJANGO_SECRET_KEY.')
+ALLOWED_HOSTS = os.environ.get(
+    'DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1'
+).split(',')
+
+# Соединение живёт DB_CONN_MAX_AGE секунд и переиспользуется запросами
+# того же потока.
+DB_CONN_MAX_AGE = int(os.environ.get('DJANGO_CONN_MAX_AGE', 600))
+DATABASES = {
+    alias: {**database, 'CONN_MAX_AGE': DB_CONN_MAX_AGE}
+    for alias, database in DATABASES.items()
+}
+BLOG_CONN_HEALTH_CHECKS = True
+
+BLOG_SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    'busy_timeout': 5000,
+}
+
+# Явный кэширующий загрузчик (с DEBUG = False Django включает его и сам).
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'loaders': [
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ],
+    },
+}]
+BLOG_WARM_TEMPLATES = True
+
+# python manage.py collectstatic
+STATICFILES_STORAGE = 'blog.storage.CompressedManifestStaticFilesStorage'
+BLOG_SERVE_STATIC = True
+BLOG_LOCAL_ASSETS = True
@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.models import Post
+from blog.pagination import EstimatedCountPaginator
+
+POSTS_URL = "/admin/blog/post/"
+COMMENTS_URL = "/admin/blog/comment/"
+
+
+def make_posts(mixer, count, **fields):
+    return mixer.cycle(count).blend(
+        "blog.Post",
+        pub_date=timezone.now() - timedelta(days=1),
+        **fields,
+    )
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(queries)
+
+
+@pytest.mark.django_db
+def test_changelist_queries_do_not_grow_with_rows(
+        mixer: Mixer, admin_client):
+    posts = make_posts(mixer, 2)
+    mixer.blend("blog.Comment", post=posts[0])
+    few_posts = count_queries(admin_client, POSTS_URL)
+    few_comments = count_queries(admin_client, COMMENTS_URL)
+    posts += make_posts(mixer, 10)
+    mixer.cycle(10).blend("blog.Comment", post=mixer.sequence(*posts))
+    assert count_queries(admin_client, POSTS_URL) == few_posts, (
+        "Число запросов списка постов в админке растёт с числом постов."
+    )
+    assert count_queries(admin_client, COMMENTS_URL) == few_comments, (
+        "Число запросов списка комментариев растёт с числом комментариев."
+    )
+
+
+@pytest.mark.django_db
+def test_large_tables_mode_uses_autocomplete_filter(
+        settings, mixer: Mixer, admin_client):
+    settings.BLOG_ADMIN_LARGE_TABLES = True
+    first, second = mixer.cycle(2).blend("blog.Category")
+    make_posts(mixer, 2, category=first)
+    make_posts(mixer, 3, category=second)
+    response = admin_client.get(POSTS_URL)
+    content = response.content.decode()
+    assert 'name="category__id__exact"' in content
+    assert "admin-autocomplete" in content
+    assert "date_hierarchy" not in response.context
+    assert "select2" in content
+
+    response = admin_client.get(
+        POSTS_URL, {"category__id__exact": second.pk}
+    )
+    assert response.status_code == 200
+    assert response.context["cl"].result_count == 3
+    assert f'value="{second.pk}" selected' in response.content.decode()
+
+
+def test_estimated_paginator_caps_filtered_count(mixer: Mixer, db):
+    make_posts(mixer, 5, is_published=True)
+    make_posts(mixer, 2, is_published=False)
+
+    class SmallLimit(EstimatedCountPaginator):
+        exact_limit = 3
+
+    paginator = SmallLimit(Post.objects.filter(is_published=True), 2)
+    assert paginator.count == 3
+    assert paginator.num_pages == 2
+    assert EstimatedCountPaginator(
+        Post.objects.filter(is_published=True), 2
+    ).count == 5
+
+
+def test_estimated_paginator_uses_statistics_for_whole_table(
+        mixer: Mixer, db):
+    make_posts(mixer, 5)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+    class SmallLimit(EstimatedCountPaginator):
+        exact_limit = 2
+
+    paginator = SmallLimit(Post.objects.all(), 2)
+    with CaptureQueriesContext(connection) as queries:
+        assert paginator.count == 5
+    assert not any("COUNT" in query["sql"] for query in queries)
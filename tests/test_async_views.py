@@ -0,0 +1,65 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog import async_views, views
+
+
+def anonymous_get(path):
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    return request
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_views_render_same_pages(mixer: Mixer, user, settings):
+    settings.BLOG_PAGE_CACHE_TIMEOUT = 0
+    category = mixer.blend("blog.Category", is_published=True)
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    cases = (
+        ("index", "/", {}),
+        ("category_posts", "/category/x/", {"category_slug": category.slug}),
+        ("profile", "/profile/x/", {"username": user.username}),
+        ("post_detail", "/posts/x/", {"post_id": post.pk}),
+    )
+    for name, path, kwargs in cases:
+        async_view = getattr(async_views, name)
+        assert asyncio.iscoroutinefunction(async_view), (
+            f"Вьюха `{name}` из blog.async_views должна быть асинхронной."
+        )
+        expected = getattr(views, name)(anonymous_get(path), **kwargs)
+        response = async_to_sync(async_view)(anonymous_get(path), **kwargs)
+        assert response.status_code == expected.status_code == 200
+        assert response.content == expected.content, (
+            f"Асинхронная вьюха `{name}` отдаёт не ту страницу, что обычная."
+        )
+
+
+def test_views_in_thread_pool_run_concurrently():
+    def slow_view(request):
+        time.sleep(0.2)
+        return request
+
+    view = async_views.in_thread_pool(slow_view)
+
+    async def run_many():
+        return await asyncio.gather(*(view(number) for number in range(4)))
+
+    start = time.perf_counter()
+    assert async_to_sync(run_many)() == [0, 1, 2, 3]
+    assert time.perf_counter() - start < 0.6, (
+        "Асинхронные вьюхи должны выполняться параллельно, а не по очереди."
+    )
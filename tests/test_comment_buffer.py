@@ -0,0 +1,122 @@
+import threading
+
+import pytest
+from django.db import IntegrityError, OperationalError
+from mixer.backend.django import Mixer
+
+from blog import comment_buffer
+from blog.comment_buffer import CommentBuffer
+from blog.models import Comment, Post
+
+
+class RecordingBuffer(CommentBuffer):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.batches = []
+
+    def _flush(self, batch):
+        self.batches.append(len(batch))
+        super()._flush(batch)
+
+
+@pytest.fixture
+def post(mixer: Mixer, user):
+    return mixer.blend("blog.Post", author=user)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_comments_saved_in_order_in_one_batch(post, user):
+    buffer = RecordingBuffer(max_delay=0.2)
+    futures = [
+        buffer.submit(Comment(post_id=post.pk, author=user, text=f"№{i}"))
+        for i in range(5)
+    ]
+    for future in futures:
+        future.result(5)
+    assert buffer.batches == [5], (
+        "Комментарии, пришедшие за время ожидания, пишутся одной пачкой."
+    )
+    assert list(
+        Comment.objects.order_by("created_at", "pk").values_list(
+            "text", flat=True
+        )
+    ) == [f"№{i}" for i in range(5)]
+    post.refresh_from_db()
+    assert post.comment_count == 5
+
+
+@pytest.mark.django_db(transaction=True)
+def test_missing_post_fails_only_its_comment(post, user):
+    buffer = CommentBuffer(max_delay=0.2)
+    good = buffer.submit(Comment(post_id=post.pk, author=user, text="ok"))
+    bad = buffer.submit(Comment(post_id=post.pk + 100, author=user, text="x"))
+    assert good.result(5).text == "ok"
+    with pytest.raises(IntegrityError):
+        bad.result(5)
+    assert list(Comment.objects.values_list("text", flat=True)) == ["ok"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_add_comment_view_uses_buffer(settings, user_client, post):
+    settings.BLOG_COMMENT_BUFFER = True
+    url = f"/posts/{post.pk}/comment/"
+    response = user_client.post(url, {"text": "Через буфер"})
+    assert response.status_code == 302
+    assert response["Location"] == f"/posts/{post.pk}/"
+    assert Comment.objects.get().text == "Через буфер"
+    assert Post.objects.get(pk=post.pk).comment_count == 1
+    response = user_client.post(
+        f"/posts/{post.pk + 100}/comment/", {"text": "Мимо"}
+    )
+    assert response.status_code == 404
+
+
+class StalledBuffer(CommentBuffer):
+    def __init__(self, error=None, **kwargs):
+        super().__init__(**kwargs)
+        self.release = threading.Event()
+        self.flushed = threading.Event()
+        self.error = error
+
+    def _flush(self, batch):
+        self.release.wait(5)
+        try:
+            if self.error:
+                raise self.error
+            super()._flush(batch)
+        finally:
+            self.flushed.set()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_stalled_flush_returns_503(settings, monkeypatch, user_client, post):
+    settings.BLOG_COMMENT_BUFFER = True
+    buffer = StalledBuffer()
+    monkeypatch.setattr(comment_buffer, "_buffer", buffer)
+    monkeypatch.setattr(comment_buffer, "SAVE_TIMEOUT", 0.1)
+    response = user_client.post(
+        f"/posts/{post.pk}/comment/", {"text": "Медленно"}
+    )
+    assert response.status_code == 503, (
+        "Убедитесь, что долгая запись буфера не превращается в ошибку 500."
+    )
+    assert response.has_header("Retry-After")
+    assert "проверьте страницу поста" in response.content.decode()
+    buffer.release.set()
+    assert buffer.flushed.wait(5)
+    assert Comment.objects.get().text == "Медленно"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_locked_database_returns_503(settings, monkeypatch, user_client, post):
+    settings.BLOG_COMMENT_BUFFER = True
+    buffer = StalledBuffer(error=OperationalError("database is locked"))
+    buffer.release.set()
+    monkeypatch.setattr(comment_buffer, "_buffer", buffer)
+    response = user_client.post(
+        f"/posts/{post.pk}/comment/", {"text": "Не записан"}
+    )
+    assert response.status_code == 503
+    assert "ещё раз" in response.content.decode()
+    assert buffer.flushed.wait(5)
+    assert not Comment.objects.exists()
@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.models import Comment, Post
+
+
+@pytest.fixture
+def post(mixer: Mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_comments(mixer: Mixer, post, user_client):
+    user_client.post(f"/posts/{post.id}/comment/", {"text": "Первый"})
+    user_client.post(f"/posts/{post.id}/comment/", {"text": "Второй"})
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что добавление комментария увеличивает счётчик"
+        " `Post.comment_count`."
+    )
+
+    comment = Comment.objects.filter(post=post).first()
+    comment.is_published = False
+    comment.save()
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что снятие комментария с публикации уменьшает счётчик."
+    )
+
+    another = Comment.objects.filter(post=post, is_published=True).get()
+    user_client.post(
+        f"/posts/{post.id}/delete_comment/{another.id}/"
+    )
+    post.refresh_from_db()
+    assert post.comment_count == 0, (
+        "Убедитесь, что удаление комментария уменьшает счётчик."
+    )
+
+
+@pytest.mark.django_db
+def test_recount_comments_command(mixer: Mixer, post):
+    mixer.cycle(3).blend("blog.Comment", post=post, is_published=True)
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+
+    call_command("recount_comments")
+
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что команда `recount_comments` восстанавливает счётчик"
+        " комментариев."
+    )
+
+
+@pytest.mark.django_db
+def test_admin_unpublish_action_refreshes_post(
+    mixer: Mixer, post, admin_client, client
+):
+    comments = mixer.cycle(2).blend("blog.Comment", post=post)
+    post.refresh_from_db()
+    updated_at = post.updated_at
+    assert "Комментарии (2)" in client.get("/").content.decode()
+
+    admin_client.post("/admin/blog/comment/", {
+        "action": "unpublish_comments",
+        "_selected_action": [comment.id for comment in comments],
+    })
+    post.refresh_from_db()
+    assert post.comment_count == 0
+    assert post.updated_at > updated_at, (
+        "Убедитесь, что действие админки обновляет `Post.updated_at`:"
+        " от него зависят Last-Modified и ETag страницы поста."
+    )
+    assert "Комментарии (0)" in client.get("/").content.decode(), (
+        "Убедитесь, что действие админки сбрасывает кэш лент."
+    )
@@ -0,0 +1,72 @@
+import re
+from html import unescape
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from blog.models import Comment
+
+EARLIER_LINK = re.compile(r'href="(/posts/\d+/comments/\?before=[^"]+)"')
+
+
+@pytest.mark.django_db
+def test_comments_load_in_chunks(
+    mixer: Mixer, post_with_published_location, client, settings
+):
+    settings.BLOG_COMMENTS_PER_PAGE = 7
+    post = post_with_published_location
+    mixer.cycle(20).blend("blog.Comment", post=post, is_published=True)
+    expected = list(
+        Comment.objects.filter(post=post).order_by("created_at", "pk")
+    )
+
+    response = client.get(f"/posts/{post.id}/")
+    chunks = [list(response.context["comments"])]
+    assert chunks[0] == expected[-7:], (
+        "Убедитесь, что на странице поста сразу показываются только самые"
+        " новые комментарии в хронологическом порядке."
+    )
+
+    content = response.content.decode("utf-8")
+    while EARLIER_LINK.search(content):
+        url = unescape(EARLIER_LINK.search(content).group(1))
+        response = client.get(url)
+        assert response.status_code == 200
+        chunks.insert(0, list(response.context["comments"]))
+        content = response.content.decode("utf-8")
+
+    loaded = [comment for chunk in chunks for comment in chunk]
+    assert loaded == expected, (
+        "Убедитесь, что подгрузка более ранних комментариев возвращает все"
+        " комментарии без пропусков и повторов."
+    )
+
+
+@pytest.mark.django_db
+def test_comment_chunk_hidden_for_unpublished_post(
+    mixer: Mixer, post_with_published_location, client
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_comment_chunk_query_budget(
+    mixer: Mixer, post_with_published_location, client
+):
+    post = post_with_published_location
+    mixer.cycle(30).blend("blog.Comment", post=post, is_published=True)
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == 200
+    # Пост с автором и категорией, порция комментариев с авторами.
+    assert len(queries) <= 2, (
+        "Убедитесь, что порция комментариев загружается не больше чем"
+        f" двумя запросами, а не {len(queries)}:\n"
+        + "\n".join(query["sql"] for query in queries)
+    )
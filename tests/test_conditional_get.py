@@ -0,0 +1,143 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from django.test import Client
+from mixer.backend.django import Mixer
+
+
+def revalidate(client, url):
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert response.has_header("ETag"), (
+        f"Убедитесь, что страница `{url}` отдаёт заголовок ETag."
+    )
+    return client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("page", ["index", "category", "profile", "detail"])
+def test_unchanged_page_returns_304(
+    post_with_published_location, user_client, page
+):
+    post = post_with_published_location
+    url = {
+        "index": "/",
+        "category": f"/category/{post.category.slug}/",
+        "profile": f"/profile/{post.author.username}/",
+        "detail": f"/posts/{post.id}/",
+    }[page]
+    response = revalidate(user_client, url)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        f"Убедитесь, что неизменившаяся страница `{url}` отвечает"
+        " 304 Not Modified на повторный запрос с If-None-Match."
+    )
+
+
+@pytest.mark.django_db
+def test_new_comment_changes_post_etag(
+    mixer: Mixer, post_with_published_location, user_client
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    etag = user_client.get(url)["ETag"]
+    mixer.blend("blog.Comment", post=post, is_published=True)
+
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что новый комментарий меняет ETag страницы поста."
+    )
+
+
+@pytest.mark.django_db
+def test_new_post_changes_feed_etag(
+    mixer: Mixer, post_with_published_location, client
+):
+    post = post_with_published_location
+    etag = client.get("/")["ETag"]
+    mixer.blend(
+        "blog.Post",
+        author=post.author,
+        category=post.category,
+        is_published=True,
+    )
+    response = client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что новый пост меняет ETag ленты."
+    )
+
+
+def csrf_from(response):
+    match = re.search(
+        r'name="csrfmiddlewaretoken" value="([^"]+)"',
+        response.content.decode(),
+    )
+    assert match, "Убедитесь, что на странице есть форма с CSRF-токеном."
+    return match.group(1)
+
+
+def log_in(client, user):
+    page = client.get("/auth/login/")
+    response = client.post("/auth/login/", {
+        "username": user.username,
+        "password": "password",
+        "csrfmiddlewaretoken": csrf_from(page),
+    })
+    assert response.status_code == HTTPStatus.FOUND
+
+
+@pytest.mark.django_db
+def test_relogin_changes_etag_and_keeps_csrf_valid(
+    post_with_published_location, user
+):
+    post = post_with_published_location
+    user.set_password("password")
+    user.save()
+    url = f"/posts/{post.id}/"
+    client = Client(enforce_csrf_checks=True)
+    log_in(client, user)
+    etag = client.get(url)["ETag"]
+
+    log_in(client, user)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что после нового входа страница с CSRF-токеном"
+        " не отвечает 304 со старым ETag."
+    )
+    response = client.post(
+        f"/posts/{post.id}/comment/",
+        {"text": "Новый комментарий", "csrfmiddlewaretoken": csrf_from(
+            response
+        )},
+    )
+    assert response.status_code == HTTPStatus.FOUND, (
+        "Убедитесь, что CSRF-токен со страницы принимается после"
+        " нового входа."
+    )
+
+
+@pytest.mark.django_db
+def test_renamed_commenter_changes_post_etag(
+    mixer: Mixer, post_with_published_location, client
+):
+    post = post_with_published_location
+    commenter = mixer.blend("auth.User")
+    mixer.blend(
+        "blog.Comment", post=post, author=commenter, is_published=True
+    )
+    url = f"/posts/{post.id}/"
+    response = client.get(url)
+    etag, last_modified = response["ETag"], response["Last-Modified"]
+
+    commenter.username = "renamed_commenter"
+    commenter.save()
+    response = client.get(
+        url,
+        HTTP_IF_NONE_MATCH=etag,
+        HTTP_IF_MODIFIED_SINCE=last_modified,
+    )
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что после смены имени комментатора страница поста"
+        " не отвечает 304 со старым именем."
+    )
+    assert "renamed_commenter" in response.content.decode()
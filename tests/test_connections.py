@@ -0,0 +1,70 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+
+from blog import connections
+
+
+def test_sqlite_pragmas_from_settings(settings):
+    settings.BLOG_SQLITE_PRAGMAS = {
+        "journal_mode": "wal", "mmap_size": 1024, "cache_size": -2000,
+    }
+    assert connections.sqlite_pragmas() == [
+        "PRAGMA journal_mode = wal",
+        "PRAGMA mmap_size = 1024",
+        "PRAGMA cache_size = -2000",
+    ]
+    settings.BLOG_SQLITE_PRAGMAS = {"journal_mode": "wal; DROP TABLE x"}
+    with pytest.raises(ImproperlyConfigured):
+        connections.sqlite_pragmas()
+
+
+@pytest.mark.django_db
+def test_pragmas_applied_to_connection(settings):
+    settings.BLOG_SQLITE_PRAGMAS = {"busy_timeout": 1234}
+    connections.apply_sqlite_pragmas(connection)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout")
+            assert cursor.fetchone()[0] == 1234
+    finally:
+        settings.BLOG_SQLITE_PRAGMAS = {"busy_timeout": 5000}
+        connections.apply_sqlite_pragmas(connection)
+
+
+class FakeConnection:
+    def __init__(self, usable):
+        self.connection = object()
+        self.usable = usable
+
+    def is_usable(self):
+        return self.usable
+
+    def close(self):
+        self.connection = None
+
+
+def test_broken_connections_are_closed(monkeypatch):
+    alive, broken, closed = (
+        FakeConnection(True), FakeConnection(False), FakeConnection(False)
+    )
+    closed.connection = None
+    monkeypatch.setattr(
+        connections.connections, "all", lambda: [alive, broken, closed]
+    )
+    connections.close_broken_connections()
+    assert alive.connection is not None
+    assert broken.connection is None
+
+
+@pytest.mark.django_db
+def test_health_checks_run_on_request(client, settings, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        connections, "close_broken_connections", lambda: calls.append(1)
+    )
+    client.get("/")
+    assert not calls
+    settings.BLOG_CONN_HEALTH_CHECKS = True
+    client.get("/")
+    assert calls, "С BLOG_CONN_HEALTH_CHECKS соединения проверяются."
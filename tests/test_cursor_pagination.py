@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_PAGE
+
+
+@pytest.fixture
+def many_posts(mixer: Mixer, user, published_category):
+    # Одинаковые даты у соседних постов проверяют сортировку по id.
+    now = timezone.now()
+    pub_dates = (now - timedelta(days=i // 2) for i in range(1, 26))
+    return mixer.cycle(25).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=pub_dates,
+    )
+
+
+@pytest.mark.django_db
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_cursor_pagination_walks_whole_feed(many_posts, client):
+    seen_ids = []
+    pages = []
+    url = "/"
+    while url:
+        response = client.get(url)
+        page_obj = response.context["page_obj"]
+        pages.append([post.id for post in page_obj])
+        seen_ids.extend(pages[-1])
+        url = f"/?after={page_obj.next_cursor}" if page_obj.has_next() else ""
+
+    expected = sorted(
+        many_posts, key=lambda post: (post.pub_date, post.id), reverse=True
+    )
+    assert seen_ids == [post.id for post in expected], (
+        "Убедитесь, что пагинация по курсору проходит всю ленту без"
+        " пропусков и повторов."
+    )
+
+    last_page = client.get(f"/?before={page_obj.previous_cursor}")
+    assert [post.id for post in last_page.context["page_obj"]] == pages[-2]
+
+
+@pytest.mark.django_db
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_cursor_pagination_skips_count(many_posts, client):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/")
+    assert len(response.context["page_obj"]) == N_PER_PAGE
+    assert not any(
+        "COUNT(" in query["sql"].upper() for query in queries
+    ), "Убедитесь, что пагинация по курсору не выполняет COUNT(*)."
@@ -0,0 +1,66 @@
+import csv
+import gzip
+import io
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+
+@pytest.fixture
+def posts(mixer: Mixer, user, published_category):
+    return mixer.cycle(3).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+@pytest.mark.django_db
+def test_export_posts_to_gzipped_jsonl(tmp_path, posts):
+    path = tmp_path / "posts.jsonl.gz"
+    call_command(
+        "export_blog", "posts", "-o", str(path), "--chunk-size=2",
+        stderr=io.StringIO(),
+    )
+    with gzip.open(path, "rt", encoding="utf-8") as dump:
+        rows = [json.loads(line) for line in dump]
+    assert [row["id"] for row in rows] == sorted(post.id for post in posts)
+    assert rows[0]["title"] == posts[0].title
+
+
+@pytest.mark.django_db
+def test_export_comments_to_csv(mixer: Mixer, posts):
+    comments = mixer.cycle(4).blend("blog.Comment", post=posts[0])
+    out = io.StringIO()
+    call_command(
+        "export_blog", "comments", "--format=csv",
+        stdout=out, stderr=io.StringIO(),
+    )
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert len(rows) == len(comments)
+    assert {int(row["post_id"]) for row in rows} == {posts[0].id}
+
+
+@pytest.mark.django_db
+def test_admin_export_action_streams_selected(admin_client, posts):
+    response = admin_client.post(
+        "/admin/blog/post/",
+        {
+            "action": "export_jsonl",
+            "_selected_action": [posts[0].id, posts[1].id],
+        },
+    )
+    assert response.status_code == 200
+    assert response.streaming, (
+        "Убедитесь, что выгрузка из админки отдаётся потоком."
+    )
+    body = b"".join(response.streaming_content).decode()
+    assert [json.loads(line)["id"] for line in body.splitlines()] == [
+        posts[0].id, posts[1].id
+    ]
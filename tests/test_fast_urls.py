@@ -0,0 +1,57 @@
+import pytest
+from django.urls import NoReverseMatch, reverse, set_script_prefix
+from mixer.backend.django import Mixer
+
+from blog import fast_urls
+from blog.fast_urls import blog_url
+
+CASES = (
+    ("index", ()),
+    ("post_detail", (7,)),
+    ("edit_comment", (7, 12)),
+    ("category_posts", ("travel-2_x",)),
+    ("profile", ("user.name+tag@x",)),
+    ("search", ()),
+)
+
+
+@pytest.mark.parametrize("name, args", CASES)
+def test_blog_url_matches_reverse(name, args):
+    expected = reverse(f"blog:{name}", args=args)
+    assert blog_url(name, *args) == expected
+    assert blog_url(f"blog:{name}", *args) == expected
+
+
+def test_blog_url_kwargs_and_script_prefix():
+    assert blog_url("edit_comment", post_id=1, comment_id=2) == reverse(
+        "blog:edit_comment", kwargs={"post_id": 1, "comment_id": 2}
+    )
+    set_script_prefix("/blogicum/")
+    try:
+        assert blog_url("post_detail", 5) == "/blogicum/posts/5/"
+        # В запросе префикс читается один раз, по сигналу request_started.
+        fast_urls.remember_script_prefix(sender=None)
+        assert blog_url("post_detail", 5) == "/blogicum/posts/5/"
+    finally:
+        fast_urls.forget_script_prefix(sender=None)
+        set_script_prefix("/")
+    assert blog_url("post_detail", 5) == "/posts/5/"
+
+
+def test_invalid_arguments_raise_like_reverse():
+    with pytest.raises(NoReverseMatch):
+        blog_url("category_posts", "не slug")
+    with pytest.raises(NoReverseMatch):
+        blog_url("post_detail")
+    with pytest.raises(NoReverseMatch):
+        blog_url("post_detail", post=1)
+
+
+@pytest.mark.django_db
+def test_get_absolute_url(mixer: Mixer, user):
+    post = mixer.blend("blog.Post", author=user)
+    assert post.get_absolute_url() == f"/posts/{post.pk}/"
+    assert post.category.get_absolute_url() == (
+        f"/category/{post.category.slug}/"
+    )
+    assert user.get_absolute_url() == f"/profile/{user.username}/"
@@ -0,0 +1,13 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+def test_feed_queries_use_indexes(post_with_published_location):
+    try:
+        call_command("check_feed_plans")
+    except Exception as e:
+        raise AssertionError(
+            "Убедитесь, что запросы лент не читают таблицу публикаций"
+            f" полным сканированием:\n{e}"
+        ) from e
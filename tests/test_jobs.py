@@ -0,0 +1,130 @@
+from datetime import timedelta
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from django.utils import timezone
+from mixer.backend.django import Mixer
+from PIL import Image
+
+from blog import jobs
+from blog.models import Job
+
+CALLS = []
+
+
+@jobs.task("test_flaky")
+def flaky(fail_times):
+    CALLS.append(fail_times)
+    if len(CALLS) <= fail_times:
+        raise RuntimeError("сбой")
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    CALLS.clear()
+
+
+def run_due_now():
+    Job.objects.update(run_after=timezone.now())
+    return jobs.run_pending()
+
+
+@pytest.mark.django_db
+def test_job_is_retried_until_success():
+    job = jobs.enqueue("test_flaky", 1)
+
+    assert jobs.run_pending() == (0, 1)
+    job.refresh_from_db()
+    assert job.status == Job.PENDING
+    assert job.run_after > timezone.now(), (
+        "Убедитесь, что повтор упавшей задачи откладывается."
+    )
+    assert "сбой" in job.last_error
+    assert jobs.run_pending() == (0, 0)
+
+    assert run_due_now() == (1, 0)
+    job.refresh_from_db()
+    assert job.status == Job.DONE
+    assert job.attempts == 2
+
+
+@pytest.mark.django_db
+def test_job_fails_after_max_attempts():
+    job = jobs.enqueue("test_flaky", 10, max_attempts=2)
+    jobs.run_pending()
+    run_due_now()
+    job.refresh_from_db()
+    assert job.status == Job.FAILED
+    assert len(CALLS) == 2
+
+
+@pytest.mark.django_db
+def test_claimed_job_is_not_taken_twice():
+    jobs.enqueue("test_flaky", 0)
+    first = jobs.claim_jobs()
+    job = next(first)
+    assert list(jobs.claim_jobs()) == [], (
+        "Убедитесь, что задачу в работе не забирает второй воркер."
+    )
+    assert job.status == Job.RUNNING
+
+
+@pytest.mark.django_db
+def test_stale_job_is_released():
+    job = jobs.enqueue("test_flaky", 0)
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.RUNNING,
+        locked_at=timezone.now() - jobs.STALE_AFTER - timedelta(minutes=1),
+    )
+    assert jobs.release_stale() == 1
+    assert jobs.run_pending() == (1, 0)
+
+
+@pytest.mark.django_db
+def test_stale_job_without_attempts_left_fails():
+    job = jobs.enqueue("test_flaky", 0, max_attempts=2)
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.RUNNING,
+        attempts=2,
+        locked_at=timezone.now() - jobs.STALE_AFTER - timedelta(minutes=1),
+    )
+    assert jobs.release_stale() == 0
+    job.refresh_from_db()
+    assert job.status == Job.FAILED, (
+        "Убедитесь, что брошенная задача без оставшихся попыток не"
+        " возвращается в очередь."
+    )
+    assert job.finished_at is not None
+    assert job.last_error
+    assert jobs.run_pending() == (0, 0)
+
+
+@pytest.mark.django_db
+def test_card_shows_original_until_worker_runs(
+    settings, tmp_path, mixer: Mixer, user, published_category, client
+):
+    settings.MEDIA_ROOT = tmp_path
+    buffer = BytesIO()
+    Image.new("RGB", (900, 600)).save(buffer, "JPEG")
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+        image=ImageFile(buffer, name="photo.jpg"),
+    )
+    assert Job.objects.filter(task="post_image", args=[post.pk]).exists()
+    assert "srcset" not in client.get("/").content.decode(), (
+        "Убедитесь, что до обработки картинки карточка показывает оригинал."
+    )
+
+    call_command("run_worker", "--once", stdout=StringIO())
+
+    assert "srcset" in client.get("/").content.decode(), (
+        "Убедитесь, что после работы воркера карточка получает копии"
+        " картинки (кэш карточки и ленты сбрасывается)."
+    )
+    assert Job.objects.get().status == Job.DONE
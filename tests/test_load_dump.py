@@ -0,0 +1,135 @@
+import gzip
+import io
+import json
+from datetime import datetime, timezone as dt_timezone
+
+import pytest
+from django.core.management import CommandError, call_command
+from mixer.backend.django import Mixer
+
+from blog.loading import iter_rows
+from blog.models import Comment, Post
+
+
+def make_dump(user):
+    """Комментарии идут раньше постов, чтобы проверить отложенные FK."""
+    rows = [
+        {
+            "model": "blog.comment",
+            "pk": 100 + i,
+            "fields": {
+                "text": f"Комментарий {i}",
+                "post": 10 + i % 2,
+                "author": user.pk,
+                "is_published": True,
+                "created_at": "2022-01-0%dT10:00:00Z" % (i + 1),
+            },
+        }
+        for i in range(5)
+    ]
+    rows += [
+        {
+            "model": "blog.post",
+            "pk": 10 + i,
+            "fields": {
+                "title": f"Пост {i}",
+                "text": "Текст",
+                "pub_date": "2022-01-01T00:00:00Z",
+                "author": user.pk,
+                "is_published": True,
+                "created_at": "2021-12-31T00:00:00Z",
+            },
+        }
+        for i in range(2)
+    ]
+    return rows
+
+
+def test_iter_rows_reads_objects_across_buffers():
+    rows = [{"model": "blog.location", "pk": i, "fields": {"name": "ы" * i}}
+            for i in range(1, 20)]
+    stream = io.StringIO(json.dumps(rows, ensure_ascii=False, indent=2))
+    assert list(iter_rows(stream, read_size=7)) == rows
+
+
+def test_iter_rows_rejects_truncated_dump():
+    with pytest.raises(ValueError):
+        list(iter_rows(io.StringIO('[{"model": "blog.post"}, {"mo')))
+
+
+@pytest.mark.django_db
+def test_load_dump_inserts_in_batches(tmp_path, user):
+    path = tmp_path / "dump.json.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as dump:
+        json.dump(make_dump(user), dump)
+
+    call_command("load_dump", str(path), "--batch-size=2", stdout=io.StringIO())
+
+    assert Post.objects.count() == 2
+    assert Comment.objects.count() == 5
+    assert Comment.objects.get(pk=100).created_at == datetime(
+        2022, 1, 1, 10, tzinfo=dt_timezone.utc
+    ), "Убедитесь, что `load_dump` сохраняет даты из дампа."
+    assert dict(Post.objects.values_list("pk", "comment_count")) == {
+        10: 3, 11: 2
+    }, "Убедитесь, что `load_dump` пересчитывает `Post.comment_count`."
+
+
+@pytest.mark.django_db
+def test_load_dump_rolls_back_on_broken_reference(tmp_path, user):
+    rows = make_dump(user)
+    rows[0]["fields"]["post"] = 999
+    path = tmp_path / "dump.json"
+    path.write_text(json.dumps(rows))
+
+    with pytest.raises(CommandError):
+        call_command("load_dump", str(path), stdout=io.StringIO())
+    assert not Comment.objects.exists(), (
+        "Убедитесь, что при ошибке `load_dump` откатывает всю загрузку."
+    )
+
+
+@pytest.mark.django_db
+def test_loaddata_accepts_dumps_without_updated_at():
+    call_command("loaddata", "db.json", verbosity=0)
+    assert Post.objects.exists()
+
+
+@pytest.mark.django_db
+def test_load_dump_refreshes_only_posts_with_new_comments(
+    mixer: Mixer, tmp_path, user
+):
+    post = mixer.blend("blog.Post", author=user)
+    other = mixer.blend("blog.Post", author=user)
+    Post.objects.filter(pk=other.pk).update(comment_count=7)
+    post.refresh_from_db()
+    updated_at = post.updated_at
+    rows = [
+        {
+            "model": "blog.comment",
+            "pk": 500 + i,
+            "fields": {
+                "text": f"Из дампа {i}",
+                "post": post.pk,
+                "author": user.pk,
+                "is_published": True,
+                "created_at": "2022-01-01T10:00:00Z",
+            },
+        }
+        for i in range(2)
+    ]
+    path = tmp_path / "comments.json"
+    path.write_text(json.dumps(rows))
+
+    call_command(
+        "load_dump", str(path), "--ignore-conflicts", stdout=io.StringIO()
+    )
+    post.refresh_from_db()
+    assert post.comment_count == 2
+    assert post.updated_at > updated_at, (
+        "Убедитесь, что `load_dump` обновляет `Post.updated_at` у постов"
+        " с новыми комментариями: от него зависит ETag страницы поста."
+    )
+    assert Post.objects.get(pk=other.pk).comment_count == 7, (
+        "Убедитесь, что `load_dump` пересчитывает только затронутые посты."
+    )
@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.cache import page_cache_timeout
+
+
+@pytest.mark.django_db
+def test_anonymous_feed_is_cached(post_with_published_location, client):
+    client.get("/")
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/")
+    assert response.status_code == 200
+    assert not queries.captured_queries, (
+        "Убедитесь, что повторный запрос ленты анонимным пользователем"
+        " обслуживается из кэша без обращений к базе данных."
+    )
+
+
+@pytest.mark.django_db
+def test_authenticated_feed_is_not_cached(
+    post_with_published_location, user_client
+):
+    user_client.get("/")
+    with CaptureQueriesContext(connection) as queries:
+        user_client.get("/")
+    assert queries.captured_queries, (
+        "Убедитесь, что ленты для авторизованных пользователей не кэшируются."
+    )
+
+
+@pytest.mark.django_db
+def test_feed_cache_purged_on_new_post(
+    mixer: Mixer, post_with_published_location, client
+):
+    post = post_with_published_location
+    client.get("/")
+    client.get(f"/category/{post.category.slug}/")
+    client.get(f"/profile/{post.author.username}/")
+    new_post = mixer.blend(
+        "blog.Post",
+        author=post.author,
+        category=post.category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(minutes=1),
+    )
+    for url in (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    ):
+        content = client.get(url).content.decode("utf-8")
+        assert new_post.title in content, (
+            "Убедитесь, что кэш лент сбрасывается при публикации поста."
+        )
+
+
+@pytest.mark.django_db
+def test_page_cache_timeout_respects_scheduled_post(
+    mixer: Mixer, user, published_category, settings
+):
+    settings.BLOG_PAGE_CACHE_TIMEOUT = 300
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(seconds=30),
+    )
+    assert page_cache_timeout() <= 30, (
+        "Убедитесь, что кэш ленты истекает к моменту выхода отложенного"
+        " поста."
+    )
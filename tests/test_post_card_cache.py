@@ -0,0 +1,46 @@
+import pytest
+from mixer.backend.django import Mixer
+
+NEW_VALUE = "Обновлённое_значение"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("related", "field"),
+    [
+        (None, "title"),
+        ("category", "title"),
+        ("location", "name"),
+        ("author", "username"),
+    ],
+    ids=["post", "category", "location", "author"],
+)
+def test_post_card_invalidation(
+    post_with_published_location, client, related, field
+):
+    post = post_with_published_location
+    client.get("/")
+
+    changed = getattr(post, related) if related else post
+    setattr(changed, field, NEW_VALUE)
+    changed.save()
+
+    content = client.get("/").content.decode("utf-8")
+    assert NEW_VALUE in content, (
+        "Убедитесь, что кэш карточки поста сбрасывается при изменении"
+        " поста, категории, местоположения или автора."
+    )
+
+
+@pytest.mark.django_db
+def test_post_card_shows_new_comment_count(
+    mixer: Mixer, post_with_published_location, client
+):
+    post = post_with_published_location
+    client.get("/")
+    mixer.blend("blog.Comment", post=post, is_published=True)
+    content = client.get("/").content.decode("utf-8")
+    assert "Комментарии (1)" in content, (
+        "Убедитесь, что карточка поста показывает актуальное число"
+        " комментариев."
+    )
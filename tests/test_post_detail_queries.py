@@ -0,0 +1,35 @@
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+N_COMMENTS = 500
+# Сессия, пользователь, валидаторы ETag, пост со связями, комментарии.
+MAX_QUERIES = 5
+
+
+@pytest.mark.django_db
+def test_post_detail_query_budget(
+    mixer: Mixer, post_with_published_location, user_client
+):
+    post = post_with_published_location
+    authors = mixer.cycle(10).blend("auth.User")
+    mixer.cycle(N_COMMENTS).blend(
+        "blog.Comment",
+        post=post,
+        author=mixer.sequence(*authors),
+        is_published=True,
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(f"/posts/{post.id}/")
+
+    assert response.status_code == 200
+    assert len(response.context["comments"]) == settings.BLOG_COMMENTS_PER_PAGE
+    assert len(queries) <= MAX_QUERIES, (
+        f"Убедитесь, что страница поста с {N_COMMENTS} комментариями"
+        f" выполняет не больше {MAX_QUERIES} запросов к базе данных,"
+        f" а не {len(queries)}:\n"
+        + "\n".join(query["sql"] for query in queries)
+    )
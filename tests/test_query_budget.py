@@ -0,0 +1,77 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.template.backends.django import Template
+from django.test import Client, RequestFactory
+
+from blog import async_views
+from blog.middleware import QueryBudgetMiddleware
+
+
+@pytest.fixture
+def budget_log(settings, tmp_path):
+    settings.BLOG_QUERY_BUDGET = True
+    settings.BLOG_QUERY_BUDGET_LOG = tmp_path / "budget.jsonl"
+    settings.BLOG_PAGE_CACHE_TIMEOUT = 0
+    return settings.BLOG_QUERY_BUDGET_LOG
+
+
+@pytest.mark.django_db
+def test_server_timing_header(budget_log, post_with_published_location):
+    response = Client().get(f"/posts/{post_with_published_location.id}/")
+    assert "db;dur=" in response["Server-Timing"], (
+        "Убедитесь, что QueryBudgetMiddleware отдаёт заголовок Server-Timing."
+    )
+    entry = json.loads(budget_log.read_text().splitlines()[0])
+    assert entry["view"] == "blog:post_detail"
+    assert entry["queries"] > 0
+    assert entry["template_ms"] > 0
+
+
+@pytest.mark.django_db
+def test_query_budget_report(
+    budget_log, post_with_published_location, capsys
+):
+    client = Client()
+    for _ in range(3):
+        client.get("/")
+    call_command("query_budget_report", "--json")
+    report = json.loads(capsys.readouterr().out)
+    assert report["blog:index"]["requests"] == 3
+    assert set(report["blog:index"]["total_ms"]) == {"p50", "p95", "p99"}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_queries_in_async_view_threads_are_counted(
+    budget_log, post_with_published_location
+):
+    def view(request):
+        return async_to_sync(async_views.index)(request)
+
+    request = RequestFactory().get("/")
+    request.user = AnonymousUser()
+    response = QueryBudgetMiddleware(view)(request)
+    assert response.status_code == 200
+    entry = json.loads(budget_log.read_text().splitlines()[0])
+    assert entry["queries"] > 0, (
+        "Убедитесь, что запросы асинхронных вьюх из пула потоков"
+        " учитываются QueryBudgetMiddleware."
+    )
+
+
+def test_middleware_disabled_by_default(client):
+    response = client.get("/pages/about/")
+    assert not response.has_header("Server-Timing")
+
+
+def test_middleware_leaves_template_class_alone(settings):
+    render = Template.render
+    settings.BLOG_QUERY_BUDGET = True
+    QueryBudgetMiddleware(lambda request: None)
+    assert Template.render is render, (
+        "Убедитесь, что QueryBudgetMiddleware не подменяет рендер шаблонов"
+        " для всего процесса: время считает движок TimedDjangoTemplates."
+    )
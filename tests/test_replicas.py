@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+from asgiref.sync import SyncToAsync, async_to_sync, sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from blog import cache, routers, schedule, views
+from blog.middleware import ReplicaMiddleware
+from blog.models import Post
+from blog.templatetags.blog_tags import fragment_cache_timeout
+
+REPLICAS = ["replica1", "replica2"]
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.BLOG_READ_REPLICAS = REPLICAS
+    settings.BLOG_REPLICA_PIN_SECONDS = 5
+    return REPLICAS
+
+
+def route(request, view):
+    """Прогоняет запрос через ReplicaMiddleware; база чтения во вьюхе."""
+    seen = {}
+
+    def get_response(request):
+        middleware.process_view(request, view, (), {})
+        seen["alias"] = routers.ReplicaRouter().db_for_read(Post)
+        return HttpResponse()
+
+    middleware = ReplicaMiddleware(get_response)
+    response = middleware(request)
+    return seen["alias"], response
+
+
+def test_public_views_read_from_replica(replicas):
+    for view in (views.index, views.category_posts, views.profile,
+                 views.post_detail, views.post_comments, views.search):
+        assert getattr(view, "replica_reads", False), (
+            f"Вьюха `{view.__name__}` должна читать с реплики."
+        )
+    request = RequestFactory().get("/")
+    alias, response = route(request, views.index)
+    assert alias in replicas
+    assert routers.PIN_COOKIE not in response.cookies
+    assert routers.ReplicaRouter().db_for_read(Post) is None, (
+        "После запроса выбор реплики должен сбрасываться."
+    )
+
+
+def test_writes_and_other_views_use_primary(replicas):
+    for view in (views.create_post, views.edit_post, views.add_comment):
+        alias, _ = route(RequestFactory().get("/"), view)
+        assert alias is None
+    alias, response = route(RequestFactory().post("/"), views.index)
+    assert alias is None
+    assert response.cookies[routers.PIN_COOKIE]["max-age"] == 5
+    assert routers.ReplicaRouter().db_for_write(Post) == routers.PRIMARY
+
+
+def test_session_reads_primary_after_write(replicas):
+    request = RequestFactory().get("/")
+    request.COOKIES[routers.PIN_COOKIE] = "1"
+    alias, _ = route(request, views.post_detail)
+    assert alias is None, (
+        "После изменений браузер должен читать с основной базы."
+    )
+
+
+def test_replicas_are_not_migrated(replicas):
+    router = routers.ReplicaRouter()
+    assert router.allow_migrate("replica1", "blog") is False
+    assert router.allow_migrate("default", "blog") is None
+
+
+@pytest.mark.django_db
+def test_without_replicas_views_use_default(client, settings):
+    settings.BLOG_READ_REPLICAS = []
+    assert client.get("/").status_code == 200
+    assert routers.ReplicaRouter().db_for_read(Post) is None
+
+
+@pytest.fixture
+def on_replica(replicas):
+    routers.use_replica(replicas[0])
+    yield
+    routers.use_replica(None)
+
+
+@pytest.mark.django_db
+def test_page_cache_is_filled_from_primary(on_replica, settings):
+    settings.BLOG_PAGE_CACHE_TIMEOUT = 60
+    seen = []
+
+    @cache.cache_anonymous_page(cache.index_feed)
+    def view(request):
+        seen.append(routers.ReplicaRouter().db_for_read(Post))
+        return HttpResponse()
+
+    request = RequestFactory().get("/")
+    request.user = AnonymousUser()
+    view(request)
+    view(request)
+    assert seen == [None], (
+        "Убедитесь, что страница, которая попадёт в кэш, читается"
+        " с основной базы, а не с реплики."
+    )
+    assert routers.reading_from_replica()
+
+
+def test_fragments_are_not_cached_from_replica(on_replica):
+    assert fragment_cache_timeout(3600) == 0
+    routers.use_replica(None)
+    assert fragment_cache_timeout(3600) == 3600
+
+
+@pytest.mark.django_db
+def test_schedule_is_read_from_primary(on_replica):
+    # Реплики нет среди DATABASES: запрос к ней бросил бы исключение.
+    assert schedule.next_pub_date() is None
+
+
+def test_middleware_supports_async(replicas):
+    seen = {}
+
+    async def get_response(request):
+        await sync_to_async(middleware.process_view)(
+            request, views.index, (), {}
+        )
+        seen["alias"] = routers.ReplicaRouter().db_for_read(Post)
+        return HttpResponse()
+
+    middleware = ReplicaMiddleware(get_response)
+    assert asyncio.iscoroutinefunction(middleware)
+    async_to_sync(middleware)(RequestFactory().get("/"))
+    assert seen["alias"] in replicas
+    assert not isinstance(ASGIHandler()._middleware_chain, SyncToAsync), (
+        "Убедитесь, что ReplicaMiddleware не переводит цепочку middleware"
+        " под ASGI в синхронный режим."
+    )
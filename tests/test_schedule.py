@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog import schedule
+
+
+@pytest.mark.django_db
+def test_next_pub_date_follows_posts(mixer: Mixer, user, published_category):
+    assert schedule.next_pub_date() is None
+
+    later = timezone.now() + timedelta(hours=2)
+    sooner = timezone.now() + timedelta(hours=1)
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=later,
+    )
+    assert schedule.next_pub_date() == later, (
+        "Убедитесь, что сохранение отложенного поста обновляет дату"
+        " ближайшей публикации."
+    )
+
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=sooner,
+    )
+    assert schedule.next_pub_date() == sooner
+
+    post.delete()
+    assert schedule.next_pub_date() == later
+
+
+@pytest.mark.django_db
+def test_valid_until_stops_at_scheduled_post(
+    mixer: Mixer, user, published_category
+):
+    scheduled = timezone.now() + timedelta(seconds=30)
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=scheduled,
+    )
+    assert schedule.valid_until(600) == scheduled
+    assert schedule.seconds_valid(600) <= 30
+    assert schedule.seconds_valid(10) <= 10
@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.models import Post
+
+
+@pytest.fixture
+def make_post(mixer: Mixer, user, published_category):
+    def make(title, text, **fields):
+        fields = {
+            "author": user,
+            "category": published_category,
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1),
+            **fields,
+        }
+        return mixer.blend("blog.Post", title=title, text=text, **fields)
+    return make
+
+
+def found_ids(client, query, page=None):
+    params = {"q": query}
+    if page:
+        params["page"] = page
+    response = client.get("/search/", params)
+    assert response.status_code == 200
+    return [post.id for post in response.context["page_obj"]]
+
+
+@pytest.mark.django_db
+def test_search_ranks_title_matches_first(make_post, client):
+    in_text = make_post("Утро", "Прогулка по набережной города")
+    in_title = make_post("Город ночью", "Огни и фонари")
+    make_post("Лес", "Ничего общего")
+
+    assert found_ids(client, "город") == [in_title.id, in_text.id], (
+        "Убедитесь, что поиск находит посты по префиксу слова и ставит"
+        " совпадения в заголовке выше совпадений в тексте."
+    )
+
+
+@pytest.mark.django_db
+def test_search_respects_visibility(make_post, client, mixer: Mixer):
+    unpublished_category = mixer.blend("blog.Category", is_published=False)
+    visible = make_post("Море", "Видимый пост")
+    make_post("Море", "Снят с публикации", is_published=False)
+    make_post(
+        "Море", "Отложенный",
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    make_post("Море", "Скрытая категория", category=unpublished_category)
+
+    assert found_ids(client, "море") == [visible.id], (
+        "Убедитесь, что поиск показывает только посты, видимые в ленте."
+    )
+
+
+@pytest.mark.django_db
+def test_search_index_follows_edits_and_deletes(make_post, client):
+    post = make_post("Горы", "Поход")
+    post.title = "Река"
+    post.save()
+    assert found_ids(client, "горы") == []
+    assert found_ids(client, "река") == [post.id]
+
+    Post.objects.get(pk=post.pk).delete()
+    assert found_ids(client, "река") == []
+
+
+@pytest.mark.django_db
+def test_search_pagination_keeps_query(make_post, client):
+    for i in range(12):
+        make_post(f"Кофе {i}", "Утренний кофе")
+    assert len(found_ids(client, "кофе")) == 10
+    assert len(found_ids(client, "кофе", page=2)) == 2
+    content = client.get("/search/", {"q": "кофе"}).content.decode()
+    assert "?q=%D0%BA%D0%BE%D1%84%D0%B5&amp;page=2" in content
+
+
+@pytest.mark.django_db
+def test_search_ignores_query_syntax(make_post, client):
+    make_post("Кофе", "Текст")
+    assert found_ids(client, '"кофе*(') == found_ids(client, "кофе")
+    assert found_ids(client, '"(*') == []
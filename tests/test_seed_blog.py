@@ -0,0 +1,64 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Count, F
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post, User
+
+
+@pytest.mark.django_db
+def test_seed_blog_creates_rows():
+    call_command(
+        "seed_blog",
+        "--users=5",
+        "--categories=2",
+        "--locations=3",
+        "--posts-per-author=fixed:4",
+        "--comments-per-post=fixed:3",
+        "--unpublished=0",
+        "--future=0",
+        "--batch-size=7",
+        stdout=StringIO(),
+    )
+
+    assert User.objects.count() == 5
+    assert Post.objects.count() == 20, (
+        "Убедитесь, что команда `seed_blog` создаёт по `--posts-per-author`"
+        " постов на каждого пользователя."
+    )
+    assert Comment.objects.count() == 60
+    assert not Post.objects.filter(pub_date__gt=timezone.now()).exists()
+    mismatched = Post.objects.annotate(
+        actual=Count("comments")
+    ).exclude(comment_count=F("actual"))
+    assert not mismatched.exists(), (
+        "Убедитесь, что команда `seed_blog` пересчитывает"
+        " `Post.comment_count` после вставки комментариев."
+    )
+
+
+@pytest.mark.django_db
+def test_seed_blog_is_reproducible():
+    options = dict(
+        users=3,
+        posts_per_author="uniform:0:5",
+        comments_per_post="exp:2",
+        stdout=StringIO(),
+    )
+    call_command("seed_blog", seed=7, prefix="first", **options)
+    first = list(Post.objects.order_by("pk").values_list("title", "text"))
+    for model in (Post, Category, Location, User):
+        model.objects.all().delete()
+    call_command("seed_blog", seed=7, prefix="second", **options)
+    second = list(Post.objects.order_by("pk").values_list("title", "text"))
+    assert first == second, (
+        "Убедитесь, что одинаковый `--seed` даёт одинаковые данные."
+    )
+
+
+@pytest.mark.django_db
+def test_seed_blog_rejects_bad_distribution():
+    with pytest.raises(CommandError):
+        call_command("seed_blog", "--posts-per-author=normal:3")
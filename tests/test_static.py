@@ -0,0 +1,93 @@
+import gzip
+
+import pytest
+from asgiref.sync import SyncToAsync, async_to_sync
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+from django.test import AsyncClient
+
+STORAGE = "blog.storage.CompressedManifestStaticFilesStorage"
+
+
+@pytest.fixture
+def collected(settings, tmp_path):
+    settings.STATIC_ROOT = tmp_path
+    settings.STATICFILES_STORAGE = STORAGE
+    call_command("collectstatic", interactive=False, verbosity=0)
+    return tmp_path
+
+
+def hashed_css(root):
+    return next(
+        path for path in (root / "css").glob("bootstrap.min.*.css")
+    )
+
+
+def test_collectstatic_writes_hashed_and_compressed_files(collected):
+    css = hashed_css(collected)
+    compressed = css.with_name(css.name + ".gz")
+    assert compressed.exists(), (
+        "Убедитесь, что collectstatic создаёт сжатую копию .gz для CSS."
+    )
+    assert gzip.decompress(compressed.read_bytes()) == css.read_bytes()
+    assert compressed.stat().st_size < css.stat().st_size
+    assert not (collected / "img" / "logo.png.gz").exists(), (
+        "Убедитесь, что картинки повторно не сжимаются."
+    )
+
+
+def test_middleware_serves_compressed_immutable_files(settings, collected,
+                                                      client):
+    settings.BLOG_SERVE_STATIC = True
+    url = settings.STATIC_URL + "css/" + hashed_css(collected).name
+    response = client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+    assert response.status_code == 200
+    assert response["Content-Encoding"] == "gzip"
+    assert response["Content-Type"].startswith("text/css")
+    assert "immutable" in response["Cache-Control"]
+    assert response["Vary"] == "Accept-Encoding"
+    body = b"".join(response.streaming_content)
+    assert gzip.decompress(body) == hashed_css(collected).read_bytes()
+
+    plain = client.get(url)
+    assert "Content-Encoding" not in plain
+    assert b"".join(plain.streaming_content) == (
+        hashed_css(collected).read_bytes()
+    )
+
+    original = client.get(settings.STATIC_URL + "css/bootstrap.min.css")
+    assert "immutable" not in original["Cache-Control"]
+
+    assert client.get(settings.STATIC_URL + "css/missing.css").status_code == (
+        404
+    )
+    assert client.get(settings.STATIC_URL + "../settings.py").status_code == (
+        404
+    )
+
+
+@pytest.mark.django_db
+def test_local_assets_replace_cdn(settings, collected, client):
+    settings.BLOG_LOCAL_ASSETS = True
+    content = client.get("/").content.decode()
+    assert "cdn.jsdelivr.net" not in content
+    assert hashed_css(collected).name in content
+
+
+def test_middleware_keeps_asgi_stack_async(settings, collected):
+    settings.BLOG_SERVE_STATIC = True
+    assert not isinstance(ASGIHandler()._middleware_chain, SyncToAsync), (
+        "Убедитесь, что StaticAssetsMiddleware не переводит цепочку"
+        " middleware под ASGI в синхронный режим."
+    )
+    url = settings.STATIC_URL + "css/" + hashed_css(collected).name
+
+    async def fetch():
+        return await AsyncClient().get(url)
+
+    response = async_to_sync(fetch)()
+    assert response.status_code == 200
+    assert "immutable" in response["Cache-Control"]
+    assert b"".join(response.streaming_content) == (
+        hashed_css(collected).read_bytes()
+    )
@@ -0,0 +1,174 @@
+from datetime import timedelta
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.images import ImageFile
+from django.utils import timezone
+from mixer.backend.django import Mixer
+from PIL import Image
+
+from blog import jobs
+from blog.images import thumbnail_name
+
+
+def make_image(width, height, name="photo.jpg"):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), (73, 109, 137)).save(
+        buffer, "PNG" if name.endswith(".png") else "JPEG"
+    )
+    return ImageFile(buffer, name=name)
+
+
+def thumbnail_paths(root, post):
+    return [
+        root / thumbnail_name(post.image.name, width, extension)
+        for width in post.thumbnails
+        for extension in ("jpg", "webp")
+    ]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def make_post(mixer: Mixer, user, published_category):
+    def make(image):
+        post = mixer.blend(
+            "blog.Post",
+            author=user,
+            category=published_category,
+            is_published=True,
+            pub_date=timezone.now() - timedelta(days=1),
+            image=image,
+        )
+        jobs.run_pending()
+        return post
+    return make
+
+
+@pytest.mark.django_db
+def test_upload_builds_thumbnails(make_post, media_root):
+    post = make_post(make_image(1600, 1200))
+    post.refresh_from_db()
+    assert post.thumbnails == [320, 640, 1280], (
+        "Убедитесь, что при загрузке картинки создаются её уменьшенные копии."
+    )
+    for width in post.thumbnails:
+        for extension, format in (("jpg", "JPEG"), ("webp", "WEBP")):
+            path = media_root / thumbnail_name(post.image.name, width, extension)
+            with Image.open(path) as thumbnail:
+                assert thumbnail.format == format
+                assert thumbnail.size == (width, width * 3 // 4)
+
+
+@pytest.mark.django_db
+def test_small_image_is_not_upscaled(make_post):
+    post = make_post(make_image(100, 80))
+    post.refresh_from_db()
+    assert post.thumbnails == [100]
+
+
+@pytest.mark.django_db
+def test_feed_uses_srcset(make_post, client):
+    post = make_post(make_image(1600, 1200))
+    content = client.get("/").content.decode()
+    assert 'type="image/webp"' in content
+    assert thumbnail_name(post.image.name, 640, "webp") in content, (
+        "Убедитесь, что карточка поста отдаёт уменьшенные копии в `srcset`."
+    )
+    assert content.count("img-thumbnail") == 1
+
+
+@pytest.mark.django_db
+def test_broken_image_falls_back_to_original(make_post, client):
+    post = make_post(ContentFile(b"not an image", name="broken.jpg"))
+    post.refresh_from_db()
+    assert post.thumbnails == []
+    content = client.get("/").content.decode()
+    assert f'src="{post.image.url}"' in content
+    assert "srcset" not in content
+
+
+@pytest.mark.django_db
+def test_clearing_image_forgets_thumbnails(make_post):
+    post = make_post(make_image(800, 600))
+    post.image = None
+    post.save()
+    post.refresh_from_db()
+    assert post.thumbnails == []
+
+
+@pytest.mark.django_db
+def test_same_stem_images_do_not_share_thumbnails(make_post, media_root):
+    png = make_post(make_image(800, 600, "photo.png"))
+    jpg = make_post(make_image(400, 300, "photo.jpg"))
+    png.refresh_from_db()
+    jpg.refresh_from_db()
+    assert not set(thumbnail_paths(media_root, png)) & set(
+        thumbnail_paths(media_root, jpg)
+    ), (
+        "Убедитесь, что у картинок photo.png и photo.jpg разные копии."
+    )
+    for path in thumbnail_paths(media_root, png):
+        with Image.open(path) as thumbnail:
+            assert thumbnail.width in (320, 640, 800)
+
+
+@pytest.mark.django_db
+def test_replaced_image_thumbnails_are_deleted(
+    make_post, media_root, django_capture_on_commit_callbacks
+):
+    post = make_post(make_image(800, 600))
+    post.refresh_from_db()
+    old_paths = thumbnail_paths(media_root, post)
+    assert all(path.exists() for path in old_paths)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        post.image = make_image(800, 600, "other.jpg")
+        post.save()
+    assert not any(path.exists() for path in old_paths), (
+        "Убедитесь, что при замене картинки её старые копии удаляются."
+    )
+
+
+@pytest.mark.django_db
+def test_deleted_post_thumbnails_are_deleted(
+    make_post, media_root, django_capture_on_commit_callbacks
+):
+    post = make_post(make_image(800, 600))
+    post.refresh_from_db()
+    paths = thumbnail_paths(media_root, post)
+    with django_capture_on_commit_callbacks(execute=True):
+        post.delete()
+    assert not any(path.exists() for path in paths), (
+        "Убедитесь, что копии картинки удаляются вместе с постом."
+    )
+
+
+@pytest.mark.django_db
+def test_shared_image_thumbnails_are_kept(
+    mixer: Mixer, make_post, media_root, django_capture_on_commit_callbacks
+):
+    post = make_post(make_image(800, 600))
+    post.refresh_from_db()
+    other = mixer.blend(
+        "blog.Post",
+        author=post.author,
+        category=post.category,
+        image=post.image.name,
+        thumbnails=post.thumbnails,
+    )
+    paths = thumbnail_paths(media_root, post)
+    with django_capture_on_commit_callbacks(execute=True):
+        post.delete()
+    assert all(path.exists() for path in paths), (
+        "Убедитесь, что копии картинки, которую показывает другой пост,"
+        " не удаляются."
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        other.delete()
+    assert not any(path.exists() for path in paths)
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import pytest
+from django.conf import settings as django_settings
+from django.core.management import CommandError, call_command
+from django.template import engines
+
+from blog.warmup import warm_templates
+
+TEMPLATES_DIR = Path(django_settings.BASE_DIR) / "templates"
+
+
+def cached_templates(settings, directory):
+    settings.TEMPLATES = [{
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [directory],
+        "OPTIONS": {
+            "context_processors":
+                django_settings.TEMPLATES[0]["OPTIONS"]["context_processors"],
+            "loaders": [("django.template.loaders.cached.Loader", [
+                "django.template.loaders.filesystem.Loader",
+                "django.template.loaders.app_directories.Loader",
+            ])],
+        },
+    }]
+
+
+def test_all_project_templates_compile():
+    loaded, errors = warm_templates()
+    assert errors == []
+    assert loaded == len(
+        [path for path in TEMPLATES_DIR.rglob("*.html") if path.is_file()]
+    )
+
+
+def test_warm_up_fills_cached_loader(settings):
+    cached_templates(settings, TEMPLATES_DIR)
+    warm_templates()
+    cache = engines["django"].engine.template_loaders[0].get_template_cache
+    for name in ("base.html", "includes/post_card.html",
+                 "includes/header.html"):
+        assert name in cache, f"Шаблон {name} должен быть в кэше загрузчика."
+
+
+def test_broken_template_is_reported(settings, tmp_path):
+    (tmp_path / "ok.html").write_text("{{ value }}")
+    (tmp_path / "broken.html").write_text("{% if %}")
+    cached_templates(settings, tmp_path)
+    loaded, errors = warm_templates()
+    assert loaded == 1
+    assert [name for name, _ in errors] == ["broken.html"]
+    with pytest.raises(CommandError):
+        call_command("warm_templates")